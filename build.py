@@ -3,8 +3,14 @@ import sys
 import shutil
 import subprocess
 import logging
+import hashlib
 from datetime import datetime
 
+try:
+    from importlib import metadata
+except ImportError:  # Python 3.8以下没有importlib.metadata
+    metadata = None
+
 def setup_logging():
     """配置日志"""
     log_dir = "logs"
@@ -43,13 +49,39 @@ def install_dependencies(logger):
         "requests"
     ]
     
+    # 依赖列表和解释器未变化时跳过安装
+    key_source = "\n".join(sorted(dependencies) + [sys.version, sys.executable])
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    marker = os.path.join("logs", f".deps_installed_{key}")
+    if os.path.exists(marker) and os.path.getmtime(marker) > os.path.getmtime(sys.executable):
+        logger.info("依赖已安装，跳过安装步骤")
+        return
+    
+    # 跳过当前解释器中已安装的依赖
+    missing = []
     for dep in dependencies:
+        if metadata is not None:
+            try:
+                metadata.version(dep)
+                logger.info(f"{dep} 已安装，跳过")
+                continue
+            except metadata.PackageNotFoundError:
+                pass
+        missing.append(dep)
+    
+    # 一次性安装所有缺失的依赖，由pip统一解析，避免多次启动pip和解析器
+    if missing:
         try:
-            logger.info(f"正在安装 {dep}...")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", dep])
+            logger.info(f"正在安装 {', '.join(missing)}...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", *missing])
         except subprocess.CalledProcessError as e:
-            logger.error(f"安装 {dep} 失败: {str(e)}")
+            logger.error(f"安装依赖失败: {str(e)}")
             raise
+    
+    # 记录安装成功的标记文件
+    os.makedirs(os.path.dirname(marker), exist_ok=True)
+    with open(marker, 'w', encoding='utf-8'):
+        pass
 
 def clean_build_directories(logger):
     """清理构建目录"""
@@ -1,9 +1,33 @@
 import os
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 from PyQt5.QtCore import QObject, pyqtSignal
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+
+def _dumps(data: Any) -> bytes:
+    """将配置数据序列化为UTF-8编码的JSON
+
+    两种实现都使用两个空格缩进，是否安装orjson不影响文件格式
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data: bytes) -> Any:
+    """解析UTF-8编码的JSON配置数据"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
 class ConfigManager(QObject):
     """配置管理器核心类"""
     
@@ -15,6 +39,8 @@ class ConfigManager(QObject):
         super().__init__()
         self.config_dir = config_dir
         self.configs: Dict[str, Dict[str, Any]] = {}
+        self._config_mtimes: Dict[str, int] = {}  # 缓存配置对应的文件修改时间
+        self._dirty: Set[str] = set()  # 已修改但尚未写入磁盘的配置
         os.makedirs(config_dir, exist_ok=True)
         self.logger = logging.getLogger("PipManager.ConfigManager")
         
@@ -54,12 +80,27 @@ class ConfigManager(QObject):
         """
         config_path = self.get_config_path(config_name)
         try:
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
+            # 存在未写入的修改时以内存中的配置为准，返回副本避免调用方修改缓存
+            if config_name in self._dirty:
+                return copy.deepcopy(self.configs[config_name])
+                
+            try:
+                mtime = os.stat(config_path).st_mtime_ns
+            except FileNotFoundError:
                 self.logger.warning(f"配置文件不存在: {config_path}")
+                self.configs.pop(config_name, None)
+                self._config_mtimes.pop(config_name, None)
                 return None
+                
+            # 文件未修改时直接使用缓存
+            if config_name in self.configs and self._config_mtimes.get(config_name) == mtime:
+                return copy.deepcopy(self.configs[config_name])
+                
+            with open(config_path, 'rb') as f:
+                config = _loads(f.read())
+            self.configs[config_name] = config
+            self._config_mtimes[config_name] = mtime
+            return copy.deepcopy(config)
         except Exception as e:
             self.logger.error(f"加载配置文件失败: {str(e)}")
             return None
@@ -77,10 +118,21 @@ class ConfigManager(QObject):
         """
         config_path = self.get_config_path(config_name)
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+            # 先在内存中完成序列化，再写入临时文件并原子替换，避免写入中断损坏配置
+            data = _dumps(config_data)
+            tmp_path = config_path + '.tmp'
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, config_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
             self.logger.info(f"配置已保存: {config_path}")
-            self.configs[config_name] = config_data
+            self.configs[config_name] = copy.deepcopy(config_data)
+            self._config_mtimes[config_name] = os.stat(config_path).st_mtime_ns
+            self._dirty.discard(config_name)
             self.config_changed.emit(config_name)
             return True
         except Exception as e:
@@ -97,18 +149,47 @@ class ConfigManager(QObject):
             logging.error(f"获取配置值 {name}.{key} 时出错: {str(e)}")
             return default
             
-    def set_config_value(self, name: str, key: str, value: Any) -> bool:
-        """设置配置值"""
+    def set_config_value(self, name: str, key: str, value: Any, autosave: bool = True) -> bool:
+        """
+        设置配置值
+        
+        Args:
+            name: 配置文件名
+            key: 配置项
+            value: 配置值
+            autosave: 是否立即保存，为False时仅标记为待保存，由flush()统一写入
+            
+        Returns:
+            bool: 是否设置成功
+        """
         try:
             config = self.load_config(name)
             config[key] = value
-            return self.save_config(name, config)
+            if autosave:
+                return self.save_config(name, config)
+                
+            self.configs[name] = config
+            self._dirty.add(name)
+            return True
         except Exception as e:
             error_msg = f"设置配置值 {name}.{key} 时出错: {str(e)}"
             logging.error(error_msg)
             self.operation_error.emit(error_msg)
             return False
             
+    def flush(self) -> bool:
+        """
+        将所有待保存的配置写入磁盘
+        
+        Returns:
+            bool: 是否全部保存成功
+        """
+        success = True
+        for name in list(self._dirty):
+            if not self.save_config(name, self.configs[name]):
+                success = False
+        return success
+        
     def delete_config(self, name: str) -> bool:
         """删除配置"""
         try:
@@ -118,6 +199,8 @@ class ConfigManager(QObject):
                 
             if name in self.configs:
                 del self.configs[name]
+            self._config_mtimes.pop(name, None)
+            self._dirty.discard(name)
                 
             self.config_changed.emit(name)
             return True
@@ -131,8 +214,9 @@ class ConfigManager(QObject):
     def list_configs(self) -> List[str]:
         """列出所有配置"""
         try:
-            return [f[:-5] for f in os.listdir(self.config_dir) 
-                   if f.endswith('.json')]
+            with os.scandir(self.config_dir) as it:
+                return [entry.name[:-5] for entry in it
+                        if entry.name.endswith('.json') and entry.is_file(follow_symlinks=False)]
         except Exception as e:
             logging.error(f"列出配置时出错: {str(e)}")
             return []
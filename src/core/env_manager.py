@@ -1,12 +1,145 @@
 import os
+import sys
+import stat
 import subprocess
 import logging
 import json
 import shutil
-from typing import List, Dict, Optional
-from PyQt5.QtCore import QObject, pyqtSignal
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QProcess
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时使用标准库json
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows下没有fcntl
+    fcntl = None
+
+# Windows下启动子进程时不创建控制台窗口
+_CREATE_NO_WINDOW = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+# Linux FICLONE ioctl，在btrfs/XFS等写时复制文件系统上创建共享数据块的副本
+_FICLONE = 0x40049409
+
+# 不支持reflink的 (源设备, 目标设备) 组合，避免重复尝试
+_REFLINK_UNSUPPORTED = set()
+
+
+def _reflink(infd: int, outfd: int) -> bool:
+    """尝试以reflink方式克隆文件
+    Args:
+        infd: 源文件描述符
+        outfd: 目标文件描述符
+    Returns:
+        bool: 是否克隆成功
+    """
+    devices = (os.fstat(infd).st_dev, os.fstat(outfd).st_dev)
+    if devices in _REFLINK_UNSUPPORTED:
+        return False
+        
+    try:
+        fcntl.ioctl(outfd, _FICLONE, infd)
+        return True
+    except OSError:
+        _REFLINK_UNSUPPORTED.add(devices)
+        return False
+
+
+def _copy_file(src: str, dst: str) -> str:
+    """复制文件并保留元数据
+    
+    在支持reflink的文件系统上直接克隆普通文件，其余情况交给shutil.copy2
+    Args:
+        src: 源文件路径
+        dst: 目标文件路径
+    Returns:
+        str: 目标文件路径
+    """
+    if fcntl is not None and sys.platform.startswith('linux'):
+        try:
+            is_regular = stat.S_ISREG(os.stat(src).st_mode)
+        except OSError:
+            is_regular = False
+        # 只克隆普通文件，打开FIFO等特殊文件会阻塞
+        if is_regular:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                cloned = _reflink(fsrc.fileno(), fdst.fileno())
+            if cloned:
+                shutil.copystat(src, dst)
+                return dst
+    return shutil.copy2(src, dst)
+
+
+def _dumps(data) -> bytes:
+    """将环境配置序列化为紧凑的UTF-8编码JSON
+
+    envs.json仅由程序读写，不需要缩进
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """解析UTF-8编码的环境配置"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _force_writable_then_retry(func, path, exc_info) -> None:
+    """shutil.rmtree的错误处理函数，去除只读属性后重试
+    Args:
+        func: 失败的删除函数
+        path: 删除失败的路径
+        exc_info: 异常信息
+    """
+    # Windows上只读文件无法直接删除
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def _fast_rmtree(path: str, root: str) -> None:
+    """删除目录树，非Windows系统优先调用rm，比shutil.rmtree逐项删除更快
+    
+    Windows上直接使用shutil.rmtree，不经过cmd，避免路径中的&、|、%等字符被cmd解析
+    Args:
+        path: 要删除的目录
+        root: 允许删除的根目录，path必须位于其中
+    """
+    real_path = os.path.realpath(path)
+    real_root = os.path.realpath(root)
+    # 只允许删除根目录下的子目录，防止误删其他位置
+    if real_path == real_root or os.path.commonpath([real_path, real_root]) != real_root:
+        raise ValueError(f"拒绝删除环境目录之外的路径: {path}")
+        
+    if os.name != 'nt':
+        try:
+            subprocess.run(['rm', '-rf', '--', real_path], check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            # 系统命令不可用或删除失败时使用shutil.rmtree
+            logging.debug(f"系统命令删除目录失败，改用shutil.rmtree: {str(e)}")
+            
+    if os.path.lexists(real_path):
+        shutil.rmtree(real_path, onerror=_force_writable_then_retry)
+
+
+@dataclass
+class EnvRecord:
+    """环境记录，加载配置时预先解析好路径"""
+    __slots__ = ('path', 'python_path', 'description', 'created_at')
+    
+    path: str
+    python_path: Optional[str]
+    description: str
+    created_at: str
+
+
 class EnvManager(QObject):
     """环境管理器核心类"""
     
@@ -14,6 +147,7 @@ class EnvManager(QObject):
     env_created = pyqtSignal(str)  # 环境创建完成信号
     env_deleted = pyqtSignal(str)  # 环境删除完成信号
     env_imported = pyqtSignal(str)  # 环境导入完成信号
+    env_create_error = pyqtSignal(str)  # 环境创建错误信号
     operation_error = pyqtSignal(str)  # 操作错误信号
     
     def __init__(self, app_data_dir: str):
@@ -29,6 +163,25 @@ class EnvManager(QObject):
         # 初始化日志
         self.logger = logging.getLogger("PipManager.EnvManager")
         
+        # 环境名称 -> 环境记录
+        self.envs: Dict[str, EnvRecord] = {}
+        
+        # Python版本缓存，键为 (解释器路径, 修改时间)
+        self._version_cache: Dict[Tuple[str, int], str] = {}
+        
+        # 环境信息缓存，值为 ((环境名称, 解释器路径, 修改时间), 环境信息)
+        self._env_info_cache: Dict[str, Tuple[Tuple[str, str, int], Dict]] = {}
+        
+        # 正在后台创建的环境，环境名称 -> 创建进程
+        self._creating: Dict[str, QProcess] = {}
+        
+        # 延迟保存环境配置，合并短时间内的多次修改
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(200)
+        self._save_timer.timeout.connect(self.flush)
+        
         try:
             # 创建必要的目录
             os.makedirs(self.envs_dir, exist_ok=True)
@@ -46,8 +199,9 @@ class EnvManager(QObject):
         """加载环境配置"""
         try:
             if os.path.exists(self.envs_config):
-                with open(self.envs_config, 'r', encoding='utf-8') as f:
-                    self.envs = json.load(f)
+                with open(self.envs_config, 'rb') as f:
+                    envs = _loads(f.read())
+                self.envs = {name: self._build_env_record(info) for name, info in envs.items()}
                 self.logger.info(f"加载环境配置成功: {len(self.envs)} 个环境")
             else:
                 self.envs = {}
@@ -57,10 +211,82 @@ class EnvManager(QObject):
             self.envs = {}
             raise
             
+    def _build_env_record(self, env_info: Dict) -> EnvRecord:
+        """根据envs.json中的环境配置构建环境记录
+        Args:
+            env_info: 环境配置
+        Returns:
+            EnvRecord: 环境记录
+        """
+        path = env_info.get('path', '')
+        # 记录的解释器可能已在程序外被删除，失效时重新查找
+        python_path = env_info.get('python_path')
+        if not python_path or not os.path.isfile(python_path):
+            python_path = self._find_python_path(path) if path else None
+        return EnvRecord(
+            path=path,
+            python_path=python_path,
+            description=env_info.get('description', ''),
+            created_at=env_info.get('created_at', '')
+        )
+        
+    @staticmethod
+    def _candidate_python_paths(path: str) -> List[str]:
+        """获取环境中Python解释器可能的路径"""
+        if os.name == 'nt':
+            return [
+                os.path.join(path, 'Scripts', 'python.exe'),
+                os.path.join(path, 'python.exe'),
+                os.path.join(path, 'bin', 'python.exe')
+            ]
+        return [
+            os.path.join(path, 'bin', 'python'),
+            os.path.join(path, 'python')
+        ]
+        
+    @classmethod
+    def _find_python_path(cls, path: str) -> Optional[str]:
+        """在环境目录中查找Python解释器
+        Args:
+            path: 环境路径
+        Returns:
+            str: 找到的解释器路径，未找到时返回None
+        """
+        for python_path in cls._candidate_python_paths(path):
+            try:
+                if stat.S_ISREG(os.stat(python_path).st_mode):
+                    return python_path
+            except OSError:
+                continue
+        return None
+            
     def save_config(self):
         """保存环境配置"""
-        with open(self.envs_config, 'w', encoding='utf-8') as f:
-            json.dump(self.envs, f, ensure_ascii=False, indent=2)
+        # 一次写入临时文件后原子替换，避免写入中断导致envs.json损坏
+        data = _dumps({name: asdict(record) for name, record in self.envs.items()})
+        tmp_path = self.envs_config + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.envs_config)
+        
+    def _schedule_save(self):
+        """标记环境配置已修改，稍后统一保存"""
+        self._dirty = True
+        self._save_timer.start()
+        
+    def flush(self):
+        """立即保存尚未写入的环境配置"""
+        if not self._dirty:
+            return
+            
+        self._save_timer.stop()
+        try:
+            self.save_config()
+            self._dirty = False
+        except Exception as e:
+            error_msg = f"保存环境配置时出错: {str(e)}"
+            self.logger.error(error_msg)
+            self.operation_error.emit(error_msg)
             
     def get_env_list(self) -> List[str]:
         """获取环境列表"""
@@ -73,8 +299,8 @@ class EnvManager(QObject):
         Returns:
             Dict: 环境信息
         """
-        env_info = self.envs.get(env_name)
-        if not env_info:
+        record = self.envs.get(env_name)
+        if not record:
             return None
             
         try:
@@ -83,29 +309,73 @@ class EnvManager(QObject):
             if not python_path:
                 return None
                 
+            # 解释器未变化时直接使用缓存
+            cache_key = (env_name, python_path, os.stat(python_path).st_mtime_ns)
+            cached = self._env_info_cache.get(env_name)
+            if cached and cached[0] == cache_key:
+                return cached[1].copy()
+                
             # 获取Python版本
-            result = subprocess.run(
-                [python_path, "--version"],
-                capture_output=True,
-                text=True
-            )
-            
-            version = result.stdout.strip() if result.returncode == 0 else "未知"
+            version = self._get_python_version(record.path, python_path)
             
             # 合并信息
-            return {
+            info = {
                 'name': env_name,
-                'path': env_info.get('path', ''),
+                'path': record.path,
                 'python_path': python_path,
                 'version': version,
-                'description': env_info.get('description', ''),
-                'created_at': env_info.get('created_at', '')
+                'description': record.description,
+                'created_at': record.created_at
             }
+            self._env_info_cache[env_name] = (cache_key, info)
+            return info.copy()
             
         except Exception as e:
             logging.error(f"获取环境信息时出错: {str(e)}")
             return None
         
+    def _get_python_version(self, env_path: str, python_path: str) -> str:
+        """获取环境的Python版本
+        Args:
+            env_path: 环境路径
+            python_path: Python解释器路径
+        Returns:
+            str: 版本信息，如 "Python 3.11.7"
+        """
+        # 优先从pyvenv.cfg读取，无需启动解释器
+        try:
+            with open(os.path.join(env_path, 'pyvenv.cfg'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, sep, value = line.partition('=')
+                    if sep and key.strip() in ('version', 'version_info'):
+                        return "Python " + '.'.join(value.strip().split('.')[:3])
+        except OSError:
+            pass
+            
+        try:
+            cache_key = (python_path, os.stat(python_path).st_mtime_ns)
+            if cache_key in self._version_cache:
+                return self._version_cache[cache_key]
+                
+            # -S 跳过site初始化，加快解释器启动；Windows下不弹出控制台窗口
+            result = subprocess.run(
+                [python_path, "-S", "-c",
+                 "import sys; print('Python %d.%d.%d' % sys.version_info[:3])"],
+                capture_output=True,
+                timeout=5,
+                creationflags=_CREATE_NO_WINDOW
+            )
+            if result.returncode != 0:
+                return "未知"
+                
+            version = result.stdout.decode('ascii', 'replace').strip()
+            self._version_cache[cache_key] = version
+            return version
+            
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.warning(f"获取Python版本失败: {str(e)}")
+            return "未知"
+            
     def get_env_python_path(self, env_name: str) -> Optional[str]:
         """获取环境Python路径
         Args:
@@ -114,44 +384,34 @@ class EnvManager(QObject):
             str: Python路径
         """
         try:
-            env_info = self.envs.get(env_name)
-            if not env_info:
+            record = self.envs.get(env_name)
+            if not record:
                 error_msg = f"环境 {env_name} 不存在"
                 self.logger.error(error_msg)
                 self.operation_error.emit(error_msg)
                 return None
                 
-            path = env_info.get('path')
-            if not path:
+            # 加载配置时已解析出解释器路径，仍存在时直接使用
+            if record.python_path:
+                if os.path.isfile(record.python_path):
+                    return record.python_path
+                record.python_path = None
+                
+            if not record.path:
                 error_msg = f"环境 {env_name} 的路径未设置"
                 self.logger.error(error_msg)
                 self.operation_error.emit(error_msg)
                 return None
                 
+            # 加载时未找到解释器或解释器已被删除，重新检查一次
             self.logger.info(f"正在检查环境 {env_name} 的Python解释器")
-            
-            # 获取环境中的Python解释器路径
-            possible_paths = []
-            if os.name == 'nt':
-                possible_paths = [
-                    os.path.join(path, 'Scripts', 'python.exe'),
-                    os.path.join(path, 'python.exe'),
-                    os.path.join(path, 'bin', 'python.exe')
-                ]
-            else:
-                possible_paths = [
-                    os.path.join(path, 'bin', 'python'),
-                    os.path.join(path, 'python')
-                ]
-            
-            # 检查所有可能的路径
-            for python_path in possible_paths:
-                if os.path.exists(python_path):
-                    self.logger.info(f"找到Python解释器: {python_path}")
-                    return python_path
-                else:
-                    self.logger.debug(f"路径不存在: {python_path}")
+            python_path = self._find_python_path(record.path)
+            if python_path:
+                self.logger.info(f"找到Python解释器: {python_path}")
+                record.python_path = python_path
+                return python_path
                 
+            possible_paths = self._candidate_python_paths(record.path)
             error_msg = f"在环境 {env_name} 中未找到Python解释器，已检查路径: {', '.join(possible_paths)}"
             self.logger.error(error_msg)
             self.operation_error.emit(error_msg)
@@ -163,17 +423,19 @@ class EnvManager(QObject):
             self.operation_error.emit(error_msg)
             return None
         
-    def create_env(self, env_name: str, path: str, description: str = "") -> bool:
+    def create_env(self, env_name: str, path: str, description: str = "", blocking: bool = True) -> bool:
         """创建环境
         Args:
             env_name: 环境名称
             path: 环境路径
             description: 环境备注
+            blocking: 是否等待创建完成。为False时在后台创建，
+                完成后发出env_created或env_create_error信号
         Returns:
-            bool: 是否成功
+            bool: 阻塞模式下表示是否成功，非阻塞模式下表示是否已开始创建
         """
         # 检查环境是否已存在
-        if env_name in self.envs:
+        if env_name in self.envs or env_name in self._creating:
             self.operation_error.emit(f"环境 {env_name} 已存在")
             return False
             
@@ -181,26 +443,92 @@ class EnvManager(QObject):
             # 在选择的路径下创建虚拟环境
             venv_path = os.path.join(path, env_name)
             
-            # 创建虚拟环境
-            result = subprocess.run(
-                ['python', '-m', 'venv', venv_path],
-                capture_output=True,
-                text=True
-            )
+            if blocking:
+                result = subprocess.run(
+                    ['python', '-m', 'venv', venv_path],
+                    capture_output=True,
+                    text=True
+                )
+                return self._finish_create_env(env_name, venv_path, description,
+                                               result.returncode, result.stderr)
+                
+            # 使用QProcess异步创建虚拟环境，避免阻塞界面线程
+            process = QProcess(self)
+            process.finished.connect(
+                lambda exit_code, exit_status: self._on_venv_process_finished(
+                    process, env_name, venv_path, description, exit_code, exit_status))
+            process.errorOccurred.connect(
+                lambda error: self._on_venv_process_error(process, env_name, error))
+            self._creating[env_name] = process
+            process.start('python', ['-m', 'venv', venv_path])
+            return True
             
-            if result.returncode != 0:
-                error_msg = f"创建虚拟环境失败: {result.stderr}"
+        except Exception as e:
+            self._creating.pop(env_name, None)
+            error_msg = f"创建环境时出错: {str(e)}"
+            logging.error(error_msg)
+            self.operation_error.emit(error_msg)
+            self.env_create_error.emit(error_msg)
+            return False
+            
+    def _on_venv_process_finished(self, process: QProcess, env_name: str, venv_path: str,
+                                  description: str, exit_code: int, exit_status) -> None:
+        """后台创建虚拟环境的进程结束处理"""
+        self._creating.pop(env_name, None)
+        stderr = bytes(process.readAllStandardError()).decode('utf-8', 'replace')
+        process.deleteLater()
+        if exit_status != QProcess.NormalExit and exit_code == 0:
+            exit_code = -1
+        self._finish_create_env(env_name, venv_path, description, exit_code, stderr)
+        
+    def _on_venv_process_error(self, process: QProcess, env_name: str, error) -> None:
+        """后台创建虚拟环境的进程启动失败处理"""
+        # 仅处理启动失败，其余错误会在finished信号中处理
+        if error != QProcess.FailedToStart:
+            return
+            
+        self._creating.pop(env_name, None)
+        process.deleteLater()
+        error_msg = f"创建虚拟环境失败: {process.errorString()}"
+        logging.error(error_msg)
+        self.operation_error.emit(error_msg)
+        self.env_create_error.emit(error_msg)
+        
+    def _finish_create_env(self, env_name: str, venv_path: str, description: str,
+                           returncode: int, stderr: str) -> bool:
+        """虚拟环境创建完成后记录环境信息
+        Args:
+            env_name: 环境名称
+            venv_path: 虚拟环境路径
+            description: 环境备注
+            returncode: 创建进程的返回码
+            stderr: 创建进程的错误输出
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            if returncode != 0:
+                error_msg = f"创建虚拟环境失败: {stderr}"
                 logging.error(error_msg)
                 self.operation_error.emit(error_msg)
+                self.env_create_error.emit(error_msg)
                 return False
                 
+            # venv创建的解释器位置是确定的
+            if os.name == 'nt':
+                python_path = os.path.join(venv_path, 'Scripts', 'python.exe')
+            else:
+                python_path = os.path.join(venv_path, 'bin', 'python')
+                
             # 保存环境信息
-            self.envs[env_name] = {
-                'path': venv_path,  # 保存虚拟环境的路径
-                'description': description,
-                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            self.save_config()
+            self._env_info_cache.pop(env_name, None)
+            self.envs[env_name] = EnvRecord(
+                path=venv_path,  # 保存虚拟环境的路径
+                python_path=python_path,
+                description=description,
+                created_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
+            self._schedule_save()
             
             self.env_created.emit(env_name)
             return True
@@ -209,6 +537,7 @@ class EnvManager(QObject):
             error_msg = f"创建环境时出错: {str(e)}"
             logging.error(error_msg)
             self.operation_error.emit(error_msg)
+            self.env_create_error.emit(error_msg)
             return False
         
     def delete_env(self, env_name: str) -> bool:
@@ -227,17 +556,7 @@ class EnvManager(QObject):
         env_dir = os.path.join(self.envs_dir, env_name)
         if os.path.exists(env_dir):
             try:
-                # 在Windows上需要先删除所有文件
-                if os.name == 'nt':
-                    for root, dirs, files in os.walk(env_dir, topdown=False):
-                        for name in files:
-                            os.remove(os.path.join(root, name))
-                        for name in dirs:
-                            os.rmdir(os.path.join(root, name))
-                    os.rmdir(env_dir)
-                else:
-                    import shutil
-                    shutil.rmtree(env_dir)
+                _fast_rmtree(env_dir, self.envs_dir)
             except Exception as e:
                 error_msg = f"删除环境时出错: {str(e)}"
                 logging.error(error_msg)
@@ -246,7 +565,8 @@ class EnvManager(QObject):
                 
         # 删除环境信息
         del self.envs[env_name]
-        self.save_config()
+        self._env_info_cache.pop(env_name, None)
+        self._schedule_save()
         
         self.env_deleted.emit(env_name)
         return True
@@ -271,7 +591,7 @@ class EnvManager(QObject):
             
         # 复制环境文件
         try:
-            shutil.copytree(source_path, env_dir, dirs_exist_ok=True)
+            shutil.copytree(source_path, env_dir, copy_function=_copy_file, dirs_exist_ok=True)
         except Exception as e:
             error_msg = f"导入环境时出错: {str(e)}"
             logging.error(error_msg)
@@ -279,12 +599,14 @@ class EnvManager(QObject):
             return False
             
         # 保存环境信息
-        self.envs[env_name] = {
-            'path': env_dir,
-            'description': f"从 {source_path} 导入",
-            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        self.save_config()
+        self._env_info_cache.pop(env_name, None)
+        self.envs[env_name] = EnvRecord(
+            path=env_dir,
+            python_path=self._find_python_path(env_dir),
+            description=f"从 {source_path} 导入",
+            created_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        )
+        self._schedule_save()
         
         self.env_imported.emit(env_name)
         return True 
\ No newline at end of file
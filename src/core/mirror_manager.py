@@ -1,15 +1,24 @@
 import os
 import json
 import time
+import socket
 import logging
-import requests
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 from src.core.config_manager import ConfigManager
 
 class MirrorManager(QObject):
     """镜像源管理器核心类"""
     
+    # 测速结果的有效期（秒）
+    SPEED_RESULT_TTL = 60
+    
+    # 持久化的测速缓存有效期（秒）
+    SPEED_CACHE_TTL = 3600
+    
     # 官方源
     OFFICIAL_MIRROR = ("PyPI官方", "https://pypi.org/simple")
     
@@ -27,13 +36,41 @@ class MirrorManager(QObject):
     mirror_removed = pyqtSignal(str)  # 镜像源删除完成信号
     mirror_changed = pyqtSignal(str, str)  # 镜像源切换完成信号(name, url)
     speed_test_finished = pyqtSignal(list)  # 测速完成信号
+    speed_test_error = pyqtSignal(str)  # 测速错误信号
     operation_error = pyqtSignal(str)  # 操作错误信号
+    _speed_cache_updated = pyqtSignal()  # 测速缓存更新信号，用于从测速线程回到主线程保存
     
     def __init__(self, config_manager: ConfigManager):
         super().__init__()
         self.config_manager = config_manager
         self.mirrors: Dict[str, str] = {}
         self.current_mirror: Optional[Tuple[str, str]] = None
+        self._mirror_addrs: Dict[str, Tuple[str, int]] = {}  # URL -> (主机, 端口)
+        self._mirror_list_cache: Optional[List[Tuple[str, str]]] = None  # 含官方源的镜像源列表
+        
+        # 最近一次测速结果及其时间
+        self._last_results: Optional[List[Tuple[str, str, float]]] = None
+        self._last_results_ts = 0.0
+        
+        # 跨运行保存的测速缓存，镜像源名称 -> {'delay_ms': 延迟毫秒, 'ts': 测速时间}
+        self._speed_cache: Dict[str, Dict[str, float]] = {}
+        self._speed_cache_lock = threading.Lock()
+        
+        # 后台测速线程
+        self._speed_test_thread: Optional[threading.Thread] = None
+        
+        # 测速共用的HTTP会话，首次使用时创建
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # 延迟保存镜像源配置，合并短时间内的多次修改
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(200)
+        self._save_timer.timeout.connect(self.flush)
+        self._speed_cache_updated.connect(self.save_mirrors)
+        
         self.load_mirrors()
         
     def load_mirrors(self) -> None:
@@ -47,6 +84,7 @@ class MirrorManager(QObject):
                     self.current_mirror = self.OFFICIAL_MIRROR
                 elif current and current in self.mirrors:
                     self.current_mirror = (current, self.mirrors[current])
+                self._speed_cache = config.get('speed_cache', {})
             
             # 如果没有镜像源，添加默认镜像源
             if not self.mirrors:
@@ -61,14 +99,29 @@ class MirrorManager(QObject):
             self.current_mirror = ("清华大学", self.mirrors["清华大学"])
             self.save_mirrors()
             
+        self._mirror_list_cache = None
+            
     def save_mirrors(self) -> None:
-        """保存镜像源配置"""
+        """保存镜像源配置，短时间内的多次修改合并为一次写入"""
+        self._dirty = True
+        self._save_timer.start()
+        
+    def flush(self) -> None:
+        """立即写入尚未保存的镜像源配置"""
+        if not self._dirty:
+            return
+            
+        self._save_timer.stop()
         try:
+            with self._speed_cache_lock:
+                speed_cache = dict(self._speed_cache)
             config = {
                 'mirrors': self.mirrors,
-                'current': self.current_mirror[0] if self.current_mirror else None
+                'current': self.current_mirror[0] if self.current_mirror else None,
+                'speed_cache': speed_cache
             }
-            self.config_manager.save_config('mirror', config)
+            if self.config_manager.save_config('mirror', config):
+                self._dirty = False
         except Exception as e:
             logging.error(f"保存镜像源配置时出错: {str(e)}")
             
@@ -85,6 +138,8 @@ class MirrorManager(QObject):
                 return False
                 
             self.mirrors[name] = url
+            self._last_results = None
+            self._mirror_list_cache = None
             self.save_mirrors()
             self.mirror_added.emit(name)
             return True
@@ -103,6 +158,10 @@ class MirrorManager(QObject):
                 return False
                 
             del self.mirrors[name]
+            with self._speed_cache_lock:
+                self._speed_cache.pop(name, None)
+            self._last_results = None
+            self._mirror_list_cache = None
             self.save_mirrors()
             self.mirror_removed.emit(name)
             return True
@@ -115,64 +174,168 @@ class MirrorManager(QObject):
             
     def get_mirror_list(self) -> List[Tuple[str, str]]:
         """获取镜像源列表，包括官方源"""
-        mirrors = [(name, url) for name, url in self.mirrors.items()]
-        return [self.OFFICIAL_MIRROR] + mirrors
+        if self._mirror_list_cache is None:
+            self._mirror_list_cache = [self.OFFICIAL_MIRROR] + list(self.mirrors.items())
+        return self._mirror_list_cache
+        
+    def _get_mirror_addr(self, url: str) -> Tuple[str, int]:
+        """解析镜像源URL的主机和端口，结果会被缓存"""
+        addr = self._mirror_addrs.get(url)
+        if addr is None:
+            parts = urlsplit(url)
+            addr = (parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+            self._mirror_addrs[url] = addr
+        return addr
         
-    def test_mirror_speed(self) -> None:
-        """测试镜像源速度"""
+    def _get_session(self):
+        """获取测速共用的HTTP会话，复用连接池
+        
+        requests导入较慢，仅在需要HTTP验证时才导入
+        """
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+        
+    def _probe(self, name: str, url: str, verify_http: bool = False) -> Tuple[str, str, float]:
+        """测试单个镜像源的延迟
+        Args:
+            name: 镜像源名称
+            url: 镜像源URL
+            verify_http: 是否通过HTTP请求验证镜像源可用，默认仅测量TCP连接时间
+        Returns:
+            Tuple[str, str, float]: (名称, URL, 延迟毫秒)，失败时延迟为inf
+        """
         try:
-            results = []
+            start_time = time.perf_counter()
+            if verify_http:
+                response = self._get_session().head(url, timeout=5, allow_redirects=False)
+                if not response.ok:
+                    return (name, url, float('inf'))
+            else:
+                sock = socket.create_connection(self._get_mirror_addr(url), timeout=5)
+                sock.close()
+            end_time = time.perf_counter()
+            
+            return (name, url, (end_time - start_time) * 1000)  # 转换为毫秒
+        except Exception as e:
+            logging.error(f"测试镜像源 {name} 时出错: {str(e)}")
+        return (name, url, float('inf'))
+        
+    def _probe_mirrors(self, mirrors: List[Tuple[str, str]],
+                       verify_http: bool = False) -> List[Tuple[str, str, float]]:
+        """并行测试指定的镜像源，并将结果写入测速缓存
+        Args:
+            mirrors: 要测试的镜像源列表 [(名称, URL)]
+            verify_http: 是否通过HTTP请求验证镜像源可用
+        Returns:
+            List[Tuple[str, str, float]]: 测速结果，顺序不定
+        """
+        if not mirrors:
+            return []
+            
+        results = []
+        with ThreadPoolExecutor(max_workers=len(mirrors)) as executor:
+            futures = [executor.submit(self._probe, name, url, verify_http)
+                       for name, url in mirrors]
+            for future in as_completed(futures):
+                results.append(future.result())
+                
+        # 更新测速缓存，失败的镜像源不缓存，下次重新测试
+        now = time.time()
+        with self._speed_cache_lock:
+            for name, url, delay in results:
+                if delay == float('inf'):
+                    self._speed_cache.pop(name, None)
+                else:
+                    self._speed_cache[name] = {'delay_ms': delay, 'ts': now}
+        self._speed_cache_updated.emit()
+        return results
+        
+    def _probe_all(self, verify_http: bool = False) -> List[Tuple[str, str, float]]:
+        """并行测试所有镜像源，结果按延迟排序"""
+        results = self._probe_mirrors(list(self.mirrors.items()), verify_http)
+        
+        # 按延迟排序
+        results.sort(key=lambda x: x[2])
+        self._last_results = results
+        self._last_results_ts = time.monotonic()
+        return results
+        
+    def _get_cached_results(self, verify_http: bool = False) -> List[Tuple[str, str, float]]:
+        """获取所有镜像源的测速结果，仅重新测试缓存已过期的镜像源"""
+        now = time.time()
+        results = []
+        stale = []
+        with self._speed_cache_lock:
             for name, url in self.mirrors.items():
-                try:
-                    # 测试连接速度
-                    start_time = time.time()
-                    response = requests.get(url, timeout=5)
-                    end_time = time.time()
+                entry = self._speed_cache.get(name)
+                if entry and now - entry['ts'] < self.SPEED_CACHE_TTL:
+                    results.append((name, url, entry['delay_ms']))
+                else:
+                    stale.append((name, url))
                     
-                    if response.status_code == 200:
-                        delay = (end_time - start_time) * 1000  # 转换为毫秒
-                        results.append((name, url, delay))
-                    else:
-                        results.append((name, url, float('inf')))
-                        
-                except Exception as e:
-                    logging.error(f"测试镜像源 {name} 时出错: {str(e)}")
-                    results.append((name, url, float('inf')))
-                    
-            # 按延迟排序
-            results.sort(key=lambda x: x[2])
+        results.extend(self._probe_mirrors(stale, verify_http))
+        results.sort(key=lambda x: x[2])
+        return results
+        
+    def test_mirror_speed(self, verify_http: bool = False) -> None:
+        """测试镜像源速度
+        Args:
+            verify_http: 是否通过HTTP请求验证镜像源可用
+        """
+        try:
+            results = self._probe_all(verify_http)
             self.speed_test_finished.emit(results)
             
         except Exception as e:
             error_msg = f"测试镜像源速度时出错: {str(e)}"
             logging.error(error_msg)
-            self.operation_error.emit(error_msg)
+            self.speed_test_error.emit(error_msg)
             
-    def get_fastest_mirror(self) -> Optional[Tuple[str, str]]:
-        """获取最快的镜像源"""
+    def test_mirror_speed_async(self, verify_http: bool = False) -> bool:
+        """在后台线程中测试镜像源速度，结果通过speed_test_finished或speed_test_error信号返回
+        Args:
+            verify_http: 是否通过HTTP请求验证镜像源可用
+        Returns:
+            bool: 是否启动了新的测速，已有测速进行中时返回False
+        """
+        if self._speed_test_thread is not None and self._speed_test_thread.is_alive():
+            return False
+            
+        self._speed_test_thread = threading.Thread(
+            target=self.test_mirror_speed,
+            args=(verify_http,),
+            daemon=True
+        )
+        self._speed_test_thread.start()
+        return True
+        
+    def get_fastest_mirror(self, verify_http: bool = False) -> Optional[Tuple[str, str]]:
+        """获取最快的镜像源
+        Args:
+            verify_http: 是否通过HTTP请求验证镜像源可用
+        """
         try:
-            if not self.mirrors:
-                return None
+            # 最近测速结果仍有效时直接使用，避免重复探测
+            if self._last_results is not None and \
+               time.monotonic() - self._last_results_ts < self.SPEED_RESULT_TTL:
+                results = self._last_results
+            else:
+                # 启动后优先使用持久化的测速缓存，只重新测试过期的镜像源
+                results = self._get_cached_results(verify_http)
                 
-            results = []
-            for name, url in self.mirrors.items():
-                try:
-                    start_time = time.time()
-                    response = requests.get(url, timeout=5)
-                    end_time = time.time()
-                    
-                    if response.status_code == 200:
-                        delay = (end_time - start_time) * 1000
-                        results.append((name, url, delay))
-                        
-                except Exception:
-                    continue
-                    
+            results = [r for r in results if r[2] != float('inf')]
             if not results:
                 return None
                 
-            # 按延迟排序
-            results.sort(key=lambda x: x[2])
             return (results[0][0], results[0][1])
             
         except Exception as e:
@@ -211,6 +374,10 @@ class MirrorManager(QObject):
         try:
             self.mirrors = self.DEFAULT_MIRRORS.copy()
             self.current_mirror = ("清华大学", self.mirrors["清华大学"])
+            with self._speed_cache_lock:
+                self._speed_cache = {}
+            self._last_results = None
+            self._mirror_list_cache = None
             self.save_mirrors()
             return True
             
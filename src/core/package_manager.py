@@ -1,11 +1,175 @@
 import os
+import re
+import locale
 import subprocess
 import logging
+import threading
+import weakref
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
 import json
 
+# PyPI JSON API，用于查询包的最新版本
+PYPI_JSON_URL = "https://pypi.org/pypi/{name}/json"
+
+# 最新版本缓存文件名，所有环境共用
+VERSION_CACHE_FILE = "pypi_versions.json"
+
+# 各环境包列表缓存文件名，加前缀避免与其他缓存文件重名
+PACKAGE_CACHE_FILE = "env-{env_name}.json"
+
+# 所有子进程额外设置的环境变量，关闭pip的彩色输出、版本检查和字节码写入
+_PIP_ENV = {
+    'PIP_NO_COLOR': '1',
+    'PIP_DISABLE_PIP_VERSION_CHECK': '1',
+    'PYTHONDONTWRITEBYTECODE': '1'
+}
+
+# 在目标解释器中一次性读取所有已安装包的元数据，避免逐个调用pip
+_DISTRIBUTIONS_SCRIPT = r"""
+import json, os, re
+import importlib.metadata as metadata
+name_re = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]*')
+extra_re = re.compile(r'\bextra\s*==')
+seen = set()
+result = []
+for dist in metadata.distributions():
+    name = dist.metadata['Name']
+    if not name or name.lower() in seen:
+        continue
+    seen.add(name.lower())
+    requires = []
+    for req in dist.requires or []:
+        if extra_re.search(req.partition(';')[2]):
+            continue
+        match = name_re.match(req)
+        if match:
+            requires.append(match.group(0))
+    # 安装时间取.dist-info目录的创建时间，找不到时由调用方扫描安装位置
+    location = dist.locate_file('')
+    ctime = None
+    stem = re.sub(r'[-_.]+', '_', name)
+    for stem in (stem, stem.lower(), name):
+        try:
+            ctime = os.path.getctime(os.path.join(location, f'{stem}-{dist.version}.dist-info'))
+            break
+        except OSError:
+            pass
+    result.append({'name': name, 'version': dist.version,
+                   'location': str(location),
+                   'requires': requires, 'ctime': ctime})
+result.sort(key=lambda item: item['name'].lower())
+print(json.dumps(result))
+"""
+
+# 获取目标解释器的site-packages目录
+_SITE_DIRS_SCRIPT = "import json, site; print(json.dumps(site.getsitepackages() + [site.getusersitepackages()]))"
+
+# pip config list输出中的索引地址配置，例如 global.index-url='https://...'
+_INDEX_CONFIG_RE = re.compile(r"^\S+\.(index-url|extra-index-url)='?(.*?)'?$")
+
+@functools.lru_cache(maxsize=None)
+def _probe_python(python_path: str) -> str:
+    """测试Python解释器，每个解释器只测试一次
+    Args:
+        python_path: Python解释器路径
+    Returns:
+        str: Python版本信息
+    Raises:
+        ValueError: 解释器无法运行
+    """
+    try:
+        result = subprocess.run(
+            [python_path, "--version"],
+            capture_output=True,
+            text=True
+        )
+    except Exception as e:
+        raise ValueError(f"测试Python解释器时出错: {str(e)}")
+        
+    if result.returncode != 0:
+        raise ValueError(f"Python解释器测试失败: {result.stderr}")
+    return result.stdout.strip()
+    
+# PEP 503包名规范化时合并的分隔符
+_CANON_SEP_RE = re.compile(r'[-_.]+')
+
+@functools.lru_cache(maxsize=None)
+def _canon(name: str) -> str:
+    """按PEP 503规范化包名，例如 Foo_Bar.baz -> foo-bar-baz"""
+    return _CANON_SEP_RE.sub('-', name).lower()
+    
+@functools.lru_cache(maxsize=None)
+def _scan_location(location: str) -> Dict[str, float]:
+    """扫描安装位置下的所有条目，每个位置只扫描一次
+    Args:
+        location: 包的安装位置
+    Returns:
+        Dict[str, float]: 目录名 -> 创建时间
+    """
+    ctimes = {}
+    try:
+        with os.scandir(location) as it:
+            for entry in it:
+                try:
+                    ctimes[entry.name] = entry.stat().st_ctime
+                except OSError:
+                    pass
+    except OSError as e:
+        logging.warning(f"扫描安装位置 {location} 失败: {str(e)}")
+    return ctimes
+    
+def _run_json(cmd: List[str], env: Optional[Dict[str, str]] = None) -> Tuple[int, object, str]:
+    """运行命令并将输出解析为JSON，输出按字节读取，不做文本解码
+    Args:
+        cmd: 要执行的命令
+        env: 子进程的环境变量，为None时继承当前进程
+    Returns:
+        Tuple[int, object, str]: (返回码, 解析结果, 错误输出)，命令失败时解析结果为None
+    Raises:
+        json.JSONDecodeError: 命令成功但输出不是合法的JSON
+    """
+    # communicate同时读取stdout和stderr，避免任一管道写满导致子进程阻塞
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    stderr = proc.stderr.decode(locale.getpreferredencoding(False), 'replace')
+    if proc.returncode != 0:
+        return proc.returncode, None, stderr
+    return proc.returncode, json.loads(proc.stdout), stderr
+    
+class PackageTask(QRunnable):
+    """在线程池中执行包管理器的耗时操作
+    
+    包管理器的信号从工作线程发出，Qt会自动以队列方式投递到界面线程
+    """
+    
+    def __init__(self, manager: 'PackageManager', method_name: str, *args):
+        """初始化任务
+        Args:
+            manager: 包管理器
+            method_name: 要执行的方法名
+            args: 传给该方法的参数
+        """
+        super().__init__()
+        self._manager = weakref.ref(manager)
+        self._method_name = method_name
+        self._args = args
+        
+    def run(self) -> None:
+        """执行任务"""
+        manager = self._manager()
+        if manager is None:
+            return
+        try:
+            getattr(manager, self._method_name)(*self._args)
+        finally:
+            manager._task_lock.release()
+            # 任务运行期间请求的增量刷新在任务结束后执行
+            if manager._refresh_pending and manager._is_running:
+                manager._start_task('refresh_packages')
+            
 class PackageManager(QObject):
     """包管理器核心类"""
     
@@ -19,18 +183,35 @@ class PackageManager(QObject):
     package_uninstall_error = pyqtSignal(str)  # 包卸载错误信号
     package_upgraded = pyqtSignal(str)  # 包更新完成信号
     package_upgrade_error = pyqtSignal(str)  # 包更新错误信号
+    packages_changed = pyqtSignal(dict, list)  # 增量刷新完成信号(新增或变化的包, 已移除的包名)
     
-    def __init__(self, python_path: str, env_name: str):
+    def __init__(self, python_path: str, env_name: str, cache_dir: Optional[str] = None):
         """初始化包管理器
         Args:
             python_path: Python解释器路径
             env_name: 环境名称
+            cache_dir: 缓存目录，为None时不使用磁盘缓存
         """
         super().__init__()
         self.python_path = python_path
         self.env_name = env_name
+        self.cache_dir = cache_dir
         self.package_info: Dict[str, dict] = {}
         self._is_running = True
+        self._site_dirs: Optional[List[str]] = None  # site-packages目录，首次使用时获取
+        self._task_lock = threading.Lock()  # 同一时间只运行一个后台任务
+        self._latest_versions: Dict[str, str] = {}  # 包名(小写) -> 最近一次检查更新得到的最新版本
+        self._last_progress = -1  # 最近一次发出的进度
+        self._refresh_pending = False  # 是否有等待执行的增量刷新
+        self._index_urls: Optional[Tuple[Optional[str], Optional[str]]] = None  # pip使用的索引地址，首次检查更新时获取
+        self._json_api: Dict[str, bool] = {}  # JSON API地址 -> 索引是否提供JSON API
+        
+        # 所有pip命令的公共前缀，跳过pip自身的版本检查和交互提示
+        self._pip_cmd = [python_path, '-m', 'pip', '--disable-pip-version-check', '--no-input']
+        
+        # 查询最新版本共用的HTTP会话，首次使用时创建
+        self._session = None
+        self._session_lock = threading.Lock()
         
         # 初始化日志
         self.logger = logging.getLogger(f"PipManager.PackageManager.{env_name}")
@@ -42,23 +223,17 @@ class PackageManager(QObject):
             self.logger.error(error_msg)
             raise ValueError(error_msg)
             
-        # 测试Python解释器
+        # 测试Python解释器，结果按解释器路径缓存
         try:
-            result = subprocess.run(
-                [python_path, "--version"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                self.logger.info(f"Python版本: {result.stdout.strip()}")
-            else:
-                error_msg = f"Python解释器测试失败: {result.stderr}"
-                self.logger.error(error_msg)
-                raise ValueError(error_msg)
-        except Exception as e:
-            error_msg = f"测试Python解释器时出错: {str(e)}"
-            self.logger.error(error_msg)
-            raise ValueError(error_msg)
+            self.python_version = _probe_python(python_path)
+            self.logger.info(f"Python版本: {self.python_version}")
+        except ValueError as e:
+            self.logger.error(str(e))
+            raise
+        
+    def _get_env(self) -> Dict[str, str]:
+        """获取子进程的环境变量，每次调用时读取，使之后应用的代理设置也能生效"""
+        return {**os.environ, **_PIP_ENV}
         
     def install_package(self, package_name: str):
         """安装包
@@ -70,7 +245,7 @@ class PackageManager(QObject):
             self.progress_updated.emit(0)
             
             # 构建安装命令
-            cmd = [self.python_path, '-m', 'pip', 'install']
+            cmd = self._pip_cmd + ['install']
             
             # 如果没有指定版本，添加--upgrade参数
             if '==' not in package_name:
@@ -83,7 +258,8 @@ class PackageManager(QObject):
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True
+                text=True,
+                env=self._get_env()
             )
             
             # 更新进度
@@ -91,7 +267,7 @@ class PackageManager(QObject):
             
             if result.returncode != 0:
                 error_msg = f"安装包失败: {result.stderr}"
-                logging.error(error_msg)
+                self.logger.error(error_msg)
                 self.package_install_error.emit(error_msg)
                 return False
                 
@@ -101,159 +277,406 @@ class PackageManager(QObject):
             
         except Exception as e:
             error_msg = f"安装包时出错: {str(e)}"
-            logging.error(error_msg)
+            self.logger.error(error_msg)
             self.package_install_error.emit(error_msg)
             return False
             
-    def check_updates(self):
-        """检查包更新"""
+    def install_requirements(self, requirements_path: str, total: int = 0) -> bool:
+        """使用一次pip install -r安装requirements文件中的所有包
+        Args:
+            requirements_path: requirements文件路径
+            total: 文件中的包数量，用于估算进度
+        Returns:
+            bool: 是否成功
+        """
         try:
-            # 显示进度条
-            self.progress_updated.emit(0)
-            
-            # 执行pip list命令获取当前包列表
-            result = subprocess.run(
-                [self.python_path, '-m', 'pip', 'list', '--format=json'],
-                capture_output=True,
-                text=True
-            )
+            self._emit_progress(0, force=True)
             
-            if result.returncode != 0:
-                error_msg = f"获取包列表失败: {result.stderr}"
-                logging.error(error_msg)
-                self.package_load_error.emit(error_msg)
-                return
+            # 逐行读取pip输出，根据Collecting和Installing行更新进度
+            cmd = self._pip_cmd + ['install', '-r', requirements_path, '--progress-bar', 'off']
+            output = []
+            collected = 0
+            with subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding=locale.getpreferredencoding(False),
+                errors='replace',
+                env=self._get_env()
+            ) as proc:
+                for line in proc.stdout:
+                    output.append(line)
+                    if line.startswith('Collecting '):
+                        collected += 1
+                        self._emit_progress(min(80, collected * 80 // max(total, 1)))
+                    elif line.startswith('Installing collected packages'):
+                        self._emit_progress(90)
+                        
+            self._emit_progress(100)
+            
+            if proc.returncode != 0:
+                # 优先显示pip的错误行
+                errors = [line for line in output if line.startswith('ERROR')] or output[-20:]
+                error_msg = f"安装包失败: {''.join(errors)}"
+                self.logger.error(error_msg)
+                self.package_install_error.emit(error_msg)
+                return False
                 
-            # 解析包信息
-            packages = json.loads(result.stdout)
+            # 安装成功后发送信号
+            self.package_installed.emit(os.path.basename(requirements_path))
+            return True
             
-            # 转换为字典格式
-            package_info = {}
-            total_packages = len(packages)
+        except Exception as e:
+            error_msg = f"安装包时出错: {str(e)}"
+            self.logger.error(error_msg)
+            self.package_install_error.emit(error_msg)
+            return False
             
-            for i, pkg in enumerate(packages):
-                name = pkg['name']
-                
-                # 获取最新版本
-                latest_result = subprocess.run(
-                    [self.python_path, '-m', 'pip', 'index', 'versions', name],
-                    capture_output=True,
-                    text=True
-                )
+    def _get_session(self):
+        """获取查询PyPI共用的HTTP会话，复用连接池"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
                 
-                latest_version = ''
-                if latest_result.returncode == 0:
-                    for line in latest_result.stdout.split('\n'):
-                        if 'LATEST:' in line:
-                            latest_version = line.split('LATEST:')[1].strip()
-                            break
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._session = session
+            return self._session
+            
+    def _load_version_cache(self) -> Dict[str, dict]:
+        """加载最新版本缓存，包名(小写) -> {'version', 'etag', 'last_modified'}"""
+        if not self.cache_dir:
+            return {}
+        try:
+            with open(os.path.join(self.cache_dir, VERSION_CACHE_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"加载版本缓存失败: {str(e)}")
+            return {}
+            
+    def _write_cache_file(self, file_name: str, data) -> None:
+        """原子地写入缓存目录下的JSON文件"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_file = os.path.join(self.cache_dir, file_name)
+        tmp_file = cache_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+        
+    def _save_version_cache(self, cache: Dict[str, dict]) -> None:
+        """保存最新版本缓存"""
+        if not self.cache_dir:
+            return
+        try:
+            self._write_cache_file(VERSION_CACHE_FILE, cache)
+        except Exception as e:
+            self.logger.warning(f"保存版本缓存失败: {str(e)}")
+            
+    def _get_index_urls(self) -> Tuple[Optional[str], Optional[str]]:
+        """获取pip使用的索引地址，环境变量优先于配置文件，结果在包管理器的生命周期内缓存
+        Returns:
+            Tuple[Optional[str], Optional[str]]: (index-url, extra-index-url)，未配置时为None
+        """
+        if self._index_urls is None:
+            self._index_urls = self._read_index_urls()
+        return self._index_urls
+        
+    def _read_index_urls(self) -> Tuple[Optional[str], Optional[str]]:
+        """从环境变量和pip config list读取索引地址"""
+        env = self._get_env()
+        urls = {
+            'index-url': env.get('PIP_INDEX_URL'),
+            'extra-index-url': env.get('PIP_EXTRA_INDEX_URL')
+        }
+        if not all(urls.values()):
+            result = subprocess.run(
+                self._pip_cmd + ['config', 'list'],
+                capture_output=True,
+                text=True,
+                env=env
+            )
+            if result.returncode == 0:
+                # 后出现的配置优先级更高
+                configured = {}
+                for line in result.stdout.splitlines():
+                    match = _INDEX_CONFIG_RE.match(line.strip())
+                    if match:
+                        configured[match.group(1)] = match.group(2)
+                for key, value in configured.items():
+                    urls[key] = urls[key] or value
+        return urls['index-url'], urls['extra-index-url']
+        
+    def _get_json_url(self) -> Optional[str]:
+        """根据pip配置的索引确定查询最新版本的JSON API地址
+        Returns:
+            Optional[str]: 带{name}占位符的地址，无法从配置的索引推导时返回None，此时改用pip list --outdated
+        """
+        index_url, extra_index_url = self._get_index_urls()
+        # 配置了多个索引时只有pip能正确合并结果
+        if extra_index_url:
+            return None
+        if not index_url:
+            return PYPI_JSON_URL
+            
+        # 与PyPI兼容的镜像在 <根地址>/simple 提供索引，在 <根地址>/pypi/<包名>/json 提供JSON API
+        base = index_url.rstrip('/')
+        if base.endswith('/simple'):
+            return base[:-len('/simple')] + '/pypi/{name}/json'
+        return None
+        
+    def _has_json_api(self, json_url: str) -> bool:
+        """检查索引是否提供JSON API，每个地址只检查一次
+        Args:
+            json_url: 带{name}占位符的JSON API地址
+        Returns:
+            bool: 是否可用，网络错误时返回False且不记录结果
+        """
+        available = self._json_api.get(json_url)
+        if available is None:
+            try:
+                response = self._get_session().get(json_url.format(name='pip'), timeout=10)
+            except Exception as e:
+                self.logger.warning(f"检查JSON API失败: {str(e)}")
+                return False
+            available = response.ok
+            if not available:
+                self.logger.info(f"索引未提供JSON API (HTTP {response.status_code})，改用pip list --outdated")
+            self._json_api[json_url] = available
+        return available
+        
+    def _fetch_latest_version(self, name: str, entry: Optional[dict], json_url: str) -> Tuple[str, Optional[dict]]:
+        """通过JSON API查询包的最新版本
+        Args:
+            name: 包名
+            entry: 该包的缓存记录，用于条件请求
+            json_url: JSON API地址
+        Returns:
+            Tuple[str, Optional[dict]]: (最新版本, 新的缓存记录)，查询失败时版本为空字符串
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
                 
-                package_info[name] = {
-                    'version': pkg['version'],
-                    'latest_version': latest_version,
-                    'location': pkg.get('location', ''),
-                    'install_time': ''  # TODO: 获取安装时间
+        try:
+            response = self._get_session().get(
+                json_url.format(name=name), headers=headers, timeout=10)
+            # 未修改时直接使用缓存的版本
+            if response.status_code == 304 and entry:
+                return entry['version'], entry
+            if response.ok:
+                version = response.json()['info']['version']
+                return version, {
+                    'index': json_url,
+                    'version': version,
+                    'etag': response.headers.get('ETag', ''),
+                    'last_modified': response.headers.get('Last-Modified', '')
                 }
-                
+            self.logger.warning(f"查询包 {name} 最新版本失败: HTTP {response.status_code}")
+        except Exception as e:
+            self.logger.warning(f"查询包 {name} 最新版本失败: {str(e)}")
+        return '', entry
+        
+    def _fetch_latest_versions(self) -> Optional[Dict[str, str]]:
+        """查询package_info中所有包的最新版本
+        Returns:
+            Optional[Dict[str, str]]: 包名 -> 最新版本，查询失败时为空字符串；pip失败时返回None
+        """
+        json_url = self._get_json_url()
+        if json_url is not None and not self._has_json_api(json_url):
+            json_url = None
+            
+        if json_url is None:
+            # 没有可用的JSON API时只调用一次pip list --outdated，未列出的包已是最新版本
+            returncode, outdated, stderr = _run_json(
+                self._pip_cmd + ['list', '--outdated', '--format=json'], self._get_env())
+            if returncode != 0:
+                error_msg = f"检查更新失败: {stderr}"
+                self.logger.error(error_msg)
+                self.package_load_error.emit(error_msg)
+                return None
+            latest = {_canon(pkg['name']): pkg['latest_version'] for pkg in outdated}
+            self._emit_progress(100)
+            return {name: latest.get(_canon(name), info['version'])
+                    for name, info in self.package_info.items()}
+                    
+        # 并发查询所有包的最新版本，只使用来自同一索引的缓存记录
+        cache = self._load_version_cache()
+        latest_versions = {}
+        total_packages = len(self.package_info)
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            futures = {}
+            for name in self.package_info:
+                entry = cache.get(name.lower())
+                if entry and entry.get('index') != json_url:
+                    entry = None
+                futures[executor.submit(self._fetch_latest_version, name, entry, json_url)] = name
+            for i, future in enumerate(as_completed(futures)):
+                name = futures[future]
+                latest_versions[name], entry = future.result()
+                if entry:
+                    cache[name.lower()] = entry
+                    
                 # 更新进度
                 progress = int((i + 1) / total_packages * 100)
-                self.progress_updated.emit(progress)
+                self._emit_progress(progress)
                 
+        self._save_version_cache(cache)
+        return latest_versions
+        
+    def check_updates(self):
+        """检查包更新"""
+        try:
+            # 显示进度条
+            self._emit_progress(0, force=True)
+            
+            # 当前包列表与加载包列表时的读取方式相同，环境未变化时直接使用缓存
+            if not self._collect_packages():
+                return
+                
+            latest_versions = self._fetch_latest_versions()
+            if latest_versions is None:
+                return
+            self._latest_versions = {name.lower(): version
+                                     for name, version in latest_versions.items() if version}
+            if not self._is_running:
+                self.logger.info("检查更新被取消")
+                return
+                
+            # 记录结构与加载包列表时相同，另外带有最新版本
+            package_info = {name: dict(info, latest_version=latest_versions.get(name, ''))
+                            for name, info in self.package_info.items()}
             self.package_loaded.emit(package_info)
             
         except Exception as e:
             error_msg = f"检查更新时出错: {str(e)}"
-            logging.error(error_msg)
+            self.logger.error(error_msg)
             self.package_load_error.emit(error_msg)
             
-    def load_packages(self) -> None:
-        """加载包列表"""
+    def _cache_path(self) -> Optional[str]:
+        """包列表缓存文件路径，未设置缓存目录时返回None"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, PACKAGE_CACHE_FILE.format(env_name=self.env_name))
+        
+    def _get_site_dirs(self) -> List[str]:
+        """获取目标解释器的site-packages目录，结果会被缓存"""
+        if self._site_dirs is None:
+            result = subprocess.run(
+                [self.python_path, '-c', _SITE_DIRS_SCRIPT],
+                capture_output=True,
+                text=True,
+                env=self._get_env()
+            )
+            if result.returncode == 0:
+                self._site_dirs = json.loads(result.stdout)
+            else:
+                self.logger.warning(f"获取site-packages目录失败: {result.stderr}")
+                self._site_dirs = []
+        return self._site_dirs
+        
+    @staticmethod
+    def _site_fingerprint(site_dirs: List[str]) -> Dict[str, Optional[int]]:
+        """计算site-packages目录的指纹，安装或卸载包都会改变目录的修改时间"""
+        fingerprint = {}
+        for site_dir in site_dirs:
+            try:
+                fingerprint[site_dir] = os.stat(site_dir).st_mtime_ns
+            except OSError:
+                fingerprint[site_dir] = None
+        return fingerprint
+        
+    def _load_package_cache(self) -> Optional[Dict[str, dict]]:
+        """加载包列表缓存，环境有变化时返回None"""
+        cache_path = self._cache_path()
+        if not cache_path:
+            return None
         try:
-            self.logger.info("开始加载包列表")
-            self.progress_updated.emit(0)
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"加载包列表缓存失败: {str(e)}")
+            return None
+            
+        fingerprint = cache.get('fingerprint')
+        if cache.get('python_path') != self.python_path or not fingerprint:
+            return None
+        if self._site_fingerprint(list(fingerprint)) != fingerprint:
+            return None
+            
+        # 缓存中已记录site-packages目录，无需再启动解释器获取
+        if self._site_dirs is None:
+            self._site_dirs = list(fingerprint)
+        return cache.get('data')
+        
+    def _save_package_cache(self, fingerprint: Dict[str, Optional[int]]) -> None:
+        """保存包列表缓存"""
+        if not self.cache_dir or not fingerprint:
+            return
+        try:
+            self._write_cache_file(PACKAGE_CACHE_FILE.format(env_name=self.env_name), {
+                'python_path': self.python_path,
+                'fingerprint': fingerprint,
+                'data': self.package_info
+            })
+        except Exception as e:
+            self.logger.warning(f"保存包列表缓存失败: {str(e)}")
             
-            # 执行pip list命令
-            cmd = [self.python_path, '-m', 'pip', 'list', '--format=json']
+    def _list_distributions(self) -> Optional[List[dict]]:
+        """在目标解释器中读取所有已安装包的元数据
+        Returns:
+            Optional[List[dict]]: 包信息列表，目标解释器不支持importlib.metadata时返回None
+        """
+        returncode, packages, stderr = _run_json([self.python_path, '-c', _DISTRIBUTIONS_SCRIPT], self._get_env())
+        if returncode != 0:
+            self.logger.warning(f"读取包元数据失败，改用pip list: {stderr}")
+            return None
+        return packages
+        
+    def _pip_list_packages(self) -> Optional[List[dict]]:
+        """通过pip list获取包列表，用于不支持importlib.metadata的解释器
+        Returns:
+            Optional[List[dict]]: 包信息列表，失败时返回None
+        """
+        # --verbose会同时给出每个包的安装位置
+        cmd = self._pip_cmd + ['list', '--format=json', '--verbose']
+        if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(f"执行命令: {' '.join(cmd)}")
+        
+        returncode, packages, stderr = _run_json(cmd, self._get_env())
+        if returncode != 0:
+            error_msg = f"获取包列表失败: {stderr}"
+            self.logger.error(error_msg)
+            self.package_load_error.emit(error_msg)
+            return None
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            self.progress_updated.emit(25)
+        return packages
+        
+    def load_packages(self, incremental: bool = False) -> None:
+        """加载包列表
+        Args:
+            incremental: 为True时只通过packages_changed信号发出与上次相比变化的包
+        """
+        old_info = self.package_info
+        try:
+            self.logger.info("开始加载包列表")
+            self._emit_progress(0, force=True)
             
-            if result.returncode != 0:
-                error_msg = f"获取包列表失败: {result.stderr}"
-                self.logger.error(error_msg)
-                self.package_load_error.emit(error_msg)
+            if not self._collect_packages():
                 return
                 
-            # 解析包信息
-            try:
-                packages = json.loads(result.stdout)
-                self.logger.info(f"找到 {len(packages)} 个包")
-            except json.JSONDecodeError as e:
-                error_msg = f"解析包列表失败: {str(e)}"
-                self.logger.error(error_msg)
-                self.package_load_error.emit(error_msg)
-                return
-                
-            # 转换为字典格式
-            package_info = {}
-            total_packages = len(packages)
-            
-            for i, pkg in enumerate(packages):
-                if not self._is_running:
-                    self.logger.info("加载包列表被取消")
-                    return
-                    
-                name = pkg['name']
-                self.logger.debug(f"处理包 {name}")
-                
-                # 获取包详细信息
-                show_result = subprocess.run(
-                    [self.python_path, '-m', 'pip', 'show', name],
-                    capture_output=True,
-                    text=True
-                )
-                
-                location = ''
-                install_time = ''
-                
-                if show_result.returncode == 0:
-                    for line in show_result.stdout.split('\n'):
-                        if line.startswith('Location:'):
-                            location = line.split(':', 1)[1].strip()
-                            self.logger.debug(f"包 {name} 的位置: {location}")
-                            
-                            # 获取安装时间
-                            try:
-                                package_path = os.path.join(location, name)
-                                if os.path.exists(package_path):
-                                    timestamp = os.path.getctime(package_path)
-                                    install_time = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                                    self.logger.debug(f"包 {name} 的安装时间: {install_time}")
-                                else:
-                                    # 尝试使用下划线替换连字符
-                                    package_path = os.path.join(location, name.replace('-', '_'))
-                                    if os.path.exists(package_path):
-                                        timestamp = os.path.getctime(package_path)
-                                        install_time = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                                        self.logger.debug(f"包 {name} 的安装时间: {install_time}")
-                            except Exception as e:
-                                self.logger.warning(f"获取包 {name} 安装时间失败: {str(e)}")
-                else:
-                    self.logger.warning(f"获取包 {name} 详细信息失败: {show_result.stderr}")
-                
-                package_info[name] = {
-                    'version': pkg['version'],
-                    'location': location,
-                    'install_time': install_time
-                }
-                
-                # 更新进度
-                progress = 25 + int((i + 1) / total_packages * 75)
-                self.progress_updated.emit(progress)
-            
             self.logger.info("包列表加载完成")
-            self.package_loaded.emit(package_info)
+            self._emit_packages(old_info, incremental)
             
         except Exception as e:
             error_msg = f"加载包列表时出错: {str(e)}"
@@ -261,78 +684,139 @@ class PackageManager(QObject):
             self.package_load_error.emit(error_msg)
             
         finally:
-            self.progress_updated.emit(100)
+            self._emit_progress(100)
+            
+    def _collect_packages(self) -> bool:
+        """读取当前环境的包信息到package_info，环境未变化时直接使用缓存
+        Returns:
+            bool: 是否成功，失败时已发出package_load_error信号
+        """
+        # 重新扫描安装位置，获取最新的安装时间
+        _scan_location.cache_clear()
+        
+        # 环境未变化时直接使用缓存
+        cached = self._load_package_cache()
+        if cached is not None:
+            self.package_info = cached
+            self.logger.info("环境未变化，使用缓存的包列表")
+            return True
             
-    def _process_package(self, package: str, index: int, total: int) -> None:
-        """处理单个包的信息"""
+        # 在读取包信息之前记录指纹，避免加载期间的变化被缓存掩盖
+        fingerprint = self._site_fingerprint(self._get_site_dirs()) if self.cache_dir else {}
+        
+        # 只启动一次目标解释器获取全部包信息
         try:
-            # 跳过空行
-            if not package.strip():
-                return
-                
-            # 分割包名和版本
-            parts = package.strip().split()
-            if len(parts) < 2:
-                logging.warning(f"跳过无效的包信息: {package}")
-                return
+            packages = self._list_distributions()
+            if packages is None:
+                packages = self._pip_list_packages()
+                if packages is None:
+                    return False
+            self.logger.info(f"找到 {len(packages)} 个包")
+        except json.JSONDecodeError as e:
+            error_msg = f"解析包列表失败: {str(e)}"
+            self.logger.error(error_msg)
+            self.package_load_error.emit(error_msg)
+            return False
+        self._emit_progress(25)
+            
+        # 转换为字典格式
+        self.package_info = {}
+        total_packages = len(packages)
+        
+        for i, pkg in enumerate(packages):
+            if not self._is_running:
+                self.logger.info("加载包列表被取消")
+                return False
                 
-            name = parts[0]
-            version = parts[1]
+            self._process_package(pkg, i, total_packages)
+            
+        self._process_package_relationships()
+        self._save_package_cache(fingerprint)
+        return True
+        
+    def _emit_packages(self, old_info: Dict[str, dict], incremental: bool) -> None:
+        """发出包列表加载结果
+        Args:
+            old_info: 加载前的包信息
+            incremental: 是否只发出变化的包
+        """
+        if not incremental:
+            self.package_loaded.emit(self.package_info)
+            return
+            
+        changed = {}
+        for name, info in self.package_info.items():
+            old = old_info.get(name)
+            if old is None or any(old.get(key) != info.get(key) for key in ('version', 'location', 'install_time', 'requires')):
+                # 保留最近一次检查更新得到的最新版本
+                changed[name] = dict(info, latest_version=self._latest_versions.get(name.lower(), ''))
+        removed = [name for name in old_info if name not in self.package_info]
+        self.logger.info(f"增量刷新完成: {len(changed)} 个包变化, {len(removed)} 个包移除")
+        self.packages_changed.emit(changed, removed)
+        
+    def refresh_packages(self) -> None:
+        """重新读取包列表，只发出与当前相比变化的包"""
+        self._refresh_pending = False
+        self.load_packages(incremental=True)
+        
+    def _process_package(self, package: dict, index: int, total: int) -> None:
+        """处理单个包的信息
+        Args:
+            package: 包信息，包含name、version、location，可选requires、ctime
+            index: 包的序号
+            total: 包的总数
+        """
+        try:
+            name = package.get('name', '')
+            version = package.get('version', '')
             
             # 跳过空包名
             if not name:
                 return
                 
-            logging.debug(f"处理包: {name} {version}")
-            
-            # 获取包信息
-            result = subprocess.run(
-                [self.python_path, "-m", "pip", "show", name],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                location = ""
-                requires = []
-                for line in result.stdout.split('\n'):
-                    if line.startswith('Location:'):
-                        location = line.split(':', 1)[1].strip()
-                    elif line.startswith('Requires:'):
-                        requires_str = line.split(':', 1)[1].strip()
-                        if requires_str:
-                            requires = [r.strip() for r in requires_str.split(',')]
-                            
-                # 获取安装时间
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                self.logger.debug(f"处理包: {name} {version}")
+            
+            location = package.get('location', '')
+            ctime = package.get('ctime')
+            if ctime:
+                install_time = datetime.fromtimestamp(ctime).strftime('%Y-%m-%d %H:%M:%S')
+            else:
                 install_time = self._get_package_install_time(location, name)
                 
-                # 确保包信息完整
-                if name and version:
-                    self.package_info[name] = {
-                        'version': version,
-                        'location': location,
-                        'install_time': install_time,
-                        'requires': requires,
-                        'row': index,
-                        'parent': None
-                    }
-                    logging.debug(f"成功处理包: {name} {version}")
-                else:
-                    logging.warning(f"包信息不完整: {name} {version}")
+            # 确保包信息完整
+            if name and version:
+                self.package_info[name] = {
+                    'version': version,
+                    'location': location,
+                    'install_time': install_time,
+                    'requires': package.get('requires', []),
+                    'requires_canon': [_canon(req) for req in package.get('requires', [])],
+                    'row': index,
+                    'parent': None
+                }
+                if debug:
+                    self.logger.debug(f"成功处理包: {name} {version}")
+            else:
+                self.logger.warning(f"包信息不完整: {name} {version}")
                 
             # 更新进度
-            progress = int((index + 1) / total * 100)
-            self.progress_updated.emit(progress)
+            progress = 25 + int((index + 1) / total * 75)
+            self._emit_progress(progress)
             
         except Exception as e:
-            logging.error(f"处理包 {package} 时出错: {str(e)}")
+            self.logger.error(f"处理包 {package} 时出错: {str(e)}")
             
     def _process_package_relationships(self) -> None:
         """处理包的父子关系"""
+        # 规范化包名 -> 包信息，依赖名与包名的大小写和分隔符可能不同
+        by_canon = {_canon(name): info for name, info in self.package_info.items()}
         for name, info in self.package_info.items():
-            for req in info['requires']:
-                if req in self.package_info:
-                    self.package_info[req]['parent'] = name
+            for req in info['requires_canon']:
+                req_info = by_canon.get(req)
+                if req_info is not None:
+                    req_info['parent'] = name
                     
     def _get_package_install_time(self, location: str, name: str) -> Optional[str]:
         """获取包的安装时间"""
@@ -340,14 +824,59 @@ class PackageManager(QObject):
             if not location or not name:
                 return None
                 
-            package_dir = os.path.join(location, name)
-            if os.path.exists(package_dir):
-                timestamp = os.path.getctime(package_dir)
+            # 尝试使用下划线替换连字符
+            ctimes = _scan_location(location)
+            timestamp = ctimes.get(name) or ctimes.get(name.replace('-', '_'))
+            if timestamp:
                 return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
         except Exception as e:
-            logging.error(f"获取包 {name} 安装时间时出错: {str(e)}")
+            self.logger.error(f"获取包 {name} 安装时间时出错: {str(e)}")
         return None
         
+    def _emit_progress(self, progress: int, force: bool = False) -> None:
+        """发出进度更新信号，进度没有变化时不发出，避免频繁刷新界面
+        Args:
+            progress: 进度百分比
+            force: 是否总是发出
+        """
+        if force or progress != self._last_progress:
+            self._last_progress = progress
+            self.progress_updated.emit(progress)
+            
+    def _start_task(self, method_name: str, *args) -> bool:
+        """在全局线程池中运行指定方法
+        Args:
+            method_name: 要执行的方法名
+            args: 传给该方法的参数
+        Returns:
+            bool: 是否启动了任务，已有任务进行中时返回False
+        """
+        if not self._task_lock.acquire(blocking=False):
+            self.logger.info("已有后台任务在运行")
+            return False
+        QThreadPool.globalInstance().start(PackageTask(self, method_name, *args))
+        return True
+        
+    def load_packages_async(self) -> bool:
+        """在后台线程中加载包列表，结果通过package_loaded信号返回"""
+        return self._start_task('load_packages')
+        
+    def refresh_packages_async(self) -> bool:
+        """在后台线程中增量刷新包列表，结果通过packages_changed信号返回
+        
+        已有后台任务在运行时，刷新会在该任务结束后执行
+        """
+        self._refresh_pending = True
+        return self._start_task('refresh_packages')
+        
+    def check_updates_async(self) -> bool:
+        """在后台线程中检查包更新，结果通过package_loaded信号返回"""
+        return self._start_task('check_updates')
+        
+    def install_requirements_async(self, requirements_path: str, total: int = 0) -> bool:
+        """在后台线程中安装requirements文件，结果通过package_installed信号返回"""
+        return self._start_task('install_requirements', requirements_path, total)
+        
     def cancel(self) -> None:
         """取消加载"""
         self._is_running = False
@@ -363,24 +892,27 @@ class PackageManager(QObject):
             self.progress_updated.emit(0)
             
             # 执行pip uninstall命令
-            result = subprocess.run([
-                self.python_path, '-m', 'pip', 'uninstall', '-y', package_name
-            ], capture_output=True, text=True)
+            result = subprocess.run(
+                self._pip_cmd + ['uninstall', '-y', package_name],
+                capture_output=True, text=True, env=self._get_env()
+            )
             
             # 更新进度
             self.progress_updated.emit(100)
             
             if result.returncode != 0:
                 error_msg = f"卸载包失败: {result.stderr}"
-                logging.error(error_msg)
+                self.logger.error(error_msg)
                 self.package_uninstall_error.emit(error_msg)
                 return False
             
+            # 已卸载的包不再参与是否为最新版本的判断
+            self.package_info.pop(package_name, None)
             self.package_uninstalled.emit(package_name)
             return True
         except Exception as e:
             error_msg = f"卸载包时出错: {str(e)}"
-            logging.error(error_msg)
+            self.logger.error(error_msg)
             self.package_uninstall_error.emit(error_msg)
             return False
 
@@ -391,15 +923,15 @@ class PackageManager(QObject):
             self.progress_updated.emit(0)
             
             # 执行pip install --upgrade命令
-            cmd = [self.python_path, '-m', 'pip', 'install', '--upgrade', package_name]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cmd = self._pip_cmd + ['install', '--upgrade', package_name]
+            result = subprocess.run(cmd, capture_output=True, text=True, env=self._get_env())
             
             # 更新进度
             self.progress_updated.emit(100)
             
             if result.returncode != 0:
                 error_msg = f"更新包失败: {result.stderr}"
-                logging.error(error_msg)
+                self.logger.error(error_msg)
                 self.package_upgrade_error.emit(error_msg)
                 return False
             
@@ -407,6 +939,6 @@ class PackageManager(QObject):
             return True
         except Exception as e:
             error_msg = f"更新包时出错: {str(e)}"
-            logging.error(error_msg)
+            self.logger.error(error_msg)
             self.package_upgrade_error.emit(error_msg)
             return False 
\ No newline at end of file
@@ -1,13 +1,16 @@
 import sys
 import os
+import queue
+import atexit
 import logging
+import logging.handlers
 import traceback
 from datetime import datetime
-from PyQt5.QtWidgets import QApplication, QMessageBox
+from PyQt5.QtWidgets import QApplication, QMessageBox, QSplashScreen
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
 from pathlib import Path
 
-from src.ui.main_window import MainWindow
 from src.core.config_manager import ConfigManager
 
 def get_app_data_dir() -> str:
@@ -18,6 +21,14 @@ def get_app_data_dir() -> str:
         app_data = os.path.join(os.path.expanduser('~'), '.pipmanager')
     return app_data
 
+# 后台写日志的监听器，退出时停止
+_log_listener = None
+
+def get_resource_path(name: str) -> str:
+    """获取资源文件路径，兼容打包后的运行环境"""
+    base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, 'resources', name)
+
 def setup_logging():
     """配置日志"""
     try:
@@ -31,14 +42,24 @@ def setup_logging():
         # 配置日志
         log_file = os.path.join(log_dir, f"pip_manager_{datetime.now().strftime('%Y%m%d')}.log")
         
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            
+        # 日志调用只放入队列，由后台线程写入文件和控制台
+        global _log_listener
+        log_queue = queue.Queue(-1)
+        _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        
+        root = logging.getLogger()
+        root.setLevel(logging.DEBUG)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
         
         return logging.getLogger("PipManager")
     except Exception as e:
@@ -160,12 +181,23 @@ def main():
         # 初始化Qt应用
         app = QApplication(sys.argv)
         
+        # 尽早显示启动画面，主窗口模块较大，在启动画面显示后再导入
+        splash = None
+        pixmap = QPixmap(get_resource_path('app_icon_large.png'))
+        if not pixmap.isNull():
+            splash = QSplashScreen(pixmap)
+            splash.show()
+            app.processEvents()
+        
         # 初始化配置
         config_manager = initialize_config(logger)
         
         # 创建并显示主窗口
+        from src.ui.main_window import MainWindow
         window = MainWindow(config_manager)
         window.show()
+        if splash:
+            splash.finish(window)
         
         # 运行应用
         sys.exit(app.exec_())
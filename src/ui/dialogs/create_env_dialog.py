@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QWidget,
                             QLineEdit, QPushButton, QFileDialog, QMessageBox)
 from PyQt5.QtCore import Qt
 
@@ -9,6 +9,7 @@ class CreateEnvDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("创建环境")
         self.setMinimumWidth(400)
+        self._env_info = None  # 验证时整理好的输入，输入变化时清空
         
         # 初始化UI
         self.init_ui()
@@ -16,34 +17,22 @@ class CreateEnvDialog(QDialog):
     def init_ui(self):
         """初始化UI"""
         layout = QVBoxLayout(self)
+        form = QFormLayout()
         
         # 环境名称
-        name_layout = QHBoxLayout()
-        name_label = QLabel("环境名称:")
         self.name_input = QLineEdit()
-        name_layout.addWidget(name_label)
-        name_layout.addWidget(self.name_input)
-        layout.addLayout(name_layout)
+        form.addRow("环境名称:", self.name_input)
         
         # 环境备注
-        desc_layout = QHBoxLayout()
-        desc_label = QLabel("环境备注:")
         self.desc_input = QLineEdit()
-        desc_layout.addWidget(desc_label)
-        desc_layout.addWidget(self.desc_input)
-        layout.addLayout(desc_layout)
+        form.addRow("环境备注:", self.desc_input)
         
         # 环境路径
-        path_layout = QHBoxLayout()
-        path_label = QLabel("环境路径:")
-        self.path_input = QLineEdit()
-        self.path_input.setReadOnly(True)
-        browse_btn = QPushButton("浏览...")
-        browse_btn.clicked.connect(self.browse_path)
-        path_layout.addWidget(path_label)
-        path_layout.addWidget(self.path_input)
-        path_layout.addWidget(browse_btn)
-        layout.addLayout(path_layout)
+        form.addRow("环境路径:", self._path_row())
+        layout.addLayout(form)
+        
+        for line_edit in (self.name_input, self.desc_input, self.path_input):
+            line_edit.textChanged.connect(self._invalidate)
         
         # 按钮
         btn_layout = QHBoxLayout()
@@ -55,6 +44,19 @@ class CreateEnvDialog(QDialog):
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
         
+    def _path_row(self) -> QWidget:
+        """创建环境路径输入行，包含路径输入框和浏览按钮"""
+        row = QWidget()
+        path_layout = QHBoxLayout(row)
+        path_layout.setContentsMargins(0, 0, 0, 0)
+        self.path_input = QLineEdit()
+        self.path_input.setReadOnly(True)
+        browse_btn = QPushButton("浏览...")
+        browse_btn.clicked.connect(self.browse_path)
+        path_layout.addWidget(self.path_input)
+        path_layout.addWidget(browse_btn)
+        return row
+        
     def browse_path(self):
         """浏览环境路径"""
         dir_path = QFileDialog.getExistingDirectory(
@@ -63,18 +65,25 @@ class CreateEnvDialog(QDialog):
         if dir_path:
             self.path_input.setText(dir_path)
             
+    def _invalidate(self):
+        """输入变化时清空整理好的输入"""
+        self._env_info = None
+        
     def get_env_info(self):
         """获取环境信息"""
-        return {
-            'name': self.name_input.text().strip(),
-            'description': self.desc_input.text().strip(),
-            'path': self.path_input.text().strip()
-        }
+        if self._env_info is None:
+            self._env_info = {
+                'name': self.name_input.text().strip(),
+                'description': self.desc_input.text().strip(),
+                'path': self.path_input.text().strip()
+            }
+        return self._env_info
         
     def validate(self):
         """验证输入"""
-        name = self.name_input.text().strip()
-        path = self.path_input.text().strip()
+        env_info = self.get_env_info()
+        name = env_info['name']
+        path = env_info['path']
         
         if not name:
             QMessageBox.warning(self, "错误", "请输入环境名称")
@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                             QLineEdit, QPushButton, QMessageBox)
 from PyQt5.QtCore import Qt
 
@@ -9,6 +9,7 @@ class InstallPackageDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("安装包")
         self.setMinimumWidth(400)
+        self._name = None  # 验证时整理好的包名，输入变化时清空
         
         # 初始化UI
         self.init_ui()
@@ -16,23 +17,19 @@ class InstallPackageDialog(QDialog):
     def init_ui(self):
         """初始化UI"""
         layout = QVBoxLayout(self)
+        form = QFormLayout()
         
         # 包名
-        name_layout = QHBoxLayout()
-        name_label = QLabel("包名:")
         self.name_input = QLineEdit()
-        name_layout.addWidget(name_label)
-        name_layout.addWidget(self.name_input)
-        layout.addLayout(name_layout)
+        form.addRow("包名:", self.name_input)
         
         # 版本
-        version_layout = QHBoxLayout()
-        version_label = QLabel("版本:")
         self.version_input = QLineEdit()
         self.version_input.setPlaceholderText("可选，例如: 1.0.0")
-        version_layout.addWidget(version_label)
-        version_layout.addWidget(self.version_input)
-        layout.addLayout(version_layout)
+        form.addRow("版本:", self.version_input)
+        layout.addLayout(form)
+        
+        self.name_input.textChanged.connect(self._invalidate)
         
         # 按钮
         btn_layout = QHBoxLayout()
@@ -44,9 +41,19 @@ class InstallPackageDialog(QDialog):
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
         
+    def _invalidate(self):
+        """输入变化时清空整理好的包名"""
+        self._name = None
+        
+    def _get_name(self) -> str:
+        """获取去除首尾空白的包名"""
+        if self._name is None:
+            self._name = self.name_input.text().strip()
+        return self._name
+        
     def get_package_info(self):
         """获取包信息"""
-        name = self.name_input.text().strip()
+        name = self._get_name()
         version = self.version_input.text().strip()
         
         if version:
@@ -56,7 +63,7 @@ class InstallPackageDialog(QDialog):
         
     def validate(self):
         """验证输入"""
-        name = self.name_input.text().strip()
+        name = self._get_name()
         
         if not name:
             QMessageBox.warning(self, "错误", "请输入包名")
@@ -1,15 +1,174 @@
-import requests
-import threading
+import ssl
+import socket
+import functools
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                             QLineEdit, QCheckBox, QPushButton, QComboBox,
                             QFormLayout, QSpinBox, QMessageBox, QProgressDialog)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QObject, pyqtSignal, QRunnable, QThreadPool
+
+# 测试连接时使用的User-Agent
+_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+               '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+@functools.lru_cache(maxsize=None)
+def _get_ssl_context() -> ssl.SSLContext:
+    """获取共用的SSL上下文，证书只解析一次"""
+    import certifi
+    return ssl.create_default_context(cafile=certifi.where())
+
+@functools.lru_cache(maxsize=None)
+def _get_adapter_class():
+    """获取使用共用SSL上下文的HTTPAdapter子类
+    
+    requests导入较慢，首次测试连接时才导入并创建该类
+    """
+    from requests.adapters import HTTPAdapter
+    
+    class _SSLContextAdapter(HTTPAdapter):
+        """使用共用SSL上下文的HTTPAdapter，避免每个连接重新加载CA证书"""
+        
+        def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+            self._ssl_context = ssl_context
+            super().__init__(**kwargs)
+            
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['ssl_context'] = self._ssl_context
+            return super().init_poolmanager(*args, **kwargs)
+            
+        def proxy_manager_for(self, proxy, **proxy_kwargs):
+            proxy_kwargs['ssl_context'] = self._ssl_context
+            return super().proxy_manager_for(proxy, **proxy_kwargs)
+            
+        def cert_verify(self, conn, url, verify, cert):
+            super().cert_verify(conn, url, verify, cert)
+            # 默认证书已加载到SSL上下文中，不再为每个连接重复加载
+            if verify is True:
+                conn.ca_certs = None
+                conn.ca_cert_dir = None
+                
+    return _SSLContextAdapter
+
+def _new_probe_session():
+    """创建测试用的HTTP会话，使用共用SSL上下文且不读取系统代理设置
+    Returns:
+        requests.Session: 新的会话，由调用方关闭
+    """
+    import requests
+    session = requests.Session()
+    session.trust_env = False  # 禁用系统代理设置
+    adapter = _get_adapter_class()(_get_ssl_context(), max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def _check_proxy_socket(proxy_host: str, proxy_port: int, timeout: float) -> tuple:
+    """测试代理服务器是否在线，在工作线程中执行
+    Args:
+        proxy_host: 代理服务器地址
+        proxy_port: 代理服务器端口
+        timeout: 连接超时（秒）
+    Returns:
+        tuple: (类型, 名称, 是否成功, 详情)
+    """
+    try:
+        # 创建socket连接测试代理服务器是否在线，依次尝试解析出的IPv4和IPv6地址
+        sock = socket.create_connection((proxy_host, proxy_port), timeout=timeout)
+        sock.close()
+        return ("proxy", "代理服务器", True, "代理服务器连接成功")
+    except OSError as e:
+        return ("proxy", "代理服务器", False, 
+            f"代理服务器无法连接 (错误代码: {e.errno})\n"
+            f"请检查：\n"
+            f"1. 代理服务器 {proxy_host}:{proxy_port} 是否已启动\n"
+            f"2. 防火墙是否允许该连接\n"
+            f"3. 代理服务器地址和端口是否正确")
+    except Exception as e:
+        return ("proxy", "代理服务器", False, f"连接代理服务器时出错: {str(e)}")
+
+def _probe_url(url: str, proxies: dict, headers: dict, timeout: tuple) -> tuple:
+    """通过代理访问外部URL，在工作线程中执行，使用单独的会话
+    Args:
+        url: 测试地址
+        proxies: requests使用的代理设置
+        headers: 请求头
+        timeout: (连接超时, 读取超时)
+    Returns:
+        tuple: (类型, 名称, 是否成功, 详情)
+    """
+    import requests
+    exceptions = requests.exceptions
+    session = _new_probe_session()
+    try:
+        # 设置详细的请求选项
+        response = session.get(
+            url,
+            proxies=proxies,
+            timeout=timeout,
+            verify=True,  # 验证SSL证书
+            allow_redirects=True,  # 允许重定向
+            headers=headers
+        )
+        
+        if response.status_code == 200:
+            return ("url", url, True, "连接成功")
+        return ("url", url, False, f"HTTP状态码: {response.status_code}")
+        
+    except exceptions.ProxyError as e:
+        error_msg = str(e)
+        if "NewConnectionError" in error_msg:
+            error_msg = (
+                "无法连接到代理服务器。可能的原因：\n"
+                "1. 代理服务器未运行或地址错误\n"
+                "2. 代理服务器拒绝连接\n"
+                "3. 防火墙阻止了连接"
+            )
+        return ("url", url, False, error_msg)
+    except exceptions.SSLError:
+        return ("url", url, False, "SSL证书验证失败")
+    except exceptions.Timeout:
+        return ("url", url, False, "连接超时")
+    except exceptions.ConnectionError as e:
+        return ("url", url, False, f"连接错误: {str(e)}")
+    except Exception as e:
+        return ("url", url, False, f"未知错误: {str(e)}")
+    finally:
+        session.close()
+
+class _ProbeSignals(QObject):
+    """将工作线程中的测试结果传回界面线程"""
+    finished = pyqtSignal(str, str, bool, str)  # 单项测试完成信号(类型, 名称, 是否成功, 详情)
+
+class ProbeTask(QRunnable):
+    """在线程池中执行单项连接测试
+    
+    任务不引用对话框，只通过信号返回结果，对话框关闭后仍在运行的测试不受影响
+    """
+    
+    def __init__(self, func, args: tuple, signals: _ProbeSignals):
+        """初始化任务
+        Args:
+            func: 模块级测试函数，返回(类型, 名称, 是否成功, 详情)，类型为"proxy"或"url"
+            args: 测试函数的参数
+            signals: 用于返回结果的信号对象
+        """
+        super().__init__()
+        self._func = func
+        self._args = args
+        self._signals = signals
+        
+    def run(self):
+        """执行测试"""
+        self._signals.finished.emit(*self._func(*self._args))
 
 class ProxyDialog(QDialog):
     """代理设置对话框"""
     
-    # 测试目标URL列表
-    TEST_URLS = [
+    # 连接超时和读取超时（秒），代理不可用时尽快失败
+    CONNECT_TIMEOUT = 2.0
+    READ_TIMEOUT = 5.0
+    
+    # 测试目标列表，均验证SSL证书
+    TEST_TARGETS = [
         "https://pypi.org",
         "https://pypi.tuna.tsinghua.edu.cn",
         "https://www.python.org"
@@ -19,6 +178,21 @@ class ProxyDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("代理设置")
         self.setMinimumWidth(400)
+        
+        # 当前测试的信号对象和结果
+        self._probe_signals = None
+        self._test_results = []
+        self._test_progress = None
+        
+        # 定时刷新测试进度，多个测试同时完成时只重绘一次
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(50)
+        self._progress_timer.timeout.connect(self._update_test_progress)
+        
+        # 代理配置和代理URL的缓存，输入变化时清空
+        self._config_cache = None
+        self._proxies_cache = None
+        
         self.init_ui()
         
     def init_ui(self):
@@ -80,14 +254,50 @@ class ProxyDialog(QDialog):
         self.enable_proxy.toggled.connect(self.on_proxy_enabled)
         self.auth_group.toggled.connect(self.on_auth_enabled)
         
+        # 任一输入变化时清空代理配置缓存
+        self.enable_proxy.toggled.connect(self._invalidate_proxy_cache)
+        self.proxy_type.currentTextChanged.connect(self._invalidate_proxy_cache)
+        self.proxy_host.textChanged.connect(self._invalidate_proxy_cache)
+        self.proxy_port.valueChanged.connect(self._invalidate_proxy_cache)
+        self.auth_group.toggled.connect(self._invalidate_proxy_cache)
+        self.proxy_username.textChanged.connect(self._invalidate_proxy_cache)
+        self.proxy_password.textChanged.connect(self._invalidate_proxy_cache)
+        
+    def _invalidate_proxy_cache(self, *args):
+        """清空代理配置缓存"""
+        self._config_cache = None
+        self._proxies_cache = None
+        
+    def _get_proxies(self) -> dict:
+        """获取requests使用的代理设置，结果会被缓存"""
+        if self._proxies_cache is None:
+            proxy_type = self.proxy_type.currentText().lower()
+            if self.auth_group.isChecked():
+                auth = f"{self.proxy_username.text()}:{self.proxy_password.text()}@"
+            else:
+                auth = ""
+                
+            proxy_url = f"{proxy_type}://{auth}{self.proxy_host.text()}:{self.proxy_port.value()}"
+            self._proxies_cache = {
+                'http': proxy_url,
+                'https': proxy_url
+            }
+        # 返回副本，避免调用方修改缓存
+        return dict(self._proxies_cache)
+        
     def on_proxy_enabled(self, enabled: bool):
         """代理启用状态变更处理"""
-        self.proxy_type.setEnabled(enabled)
-        self.proxy_host.setEnabled(enabled)
-        self.proxy_port.setEnabled(enabled)
-        self.auth_group.setEnabled(enabled)
-        if not enabled:
-            self.auth_group.setChecked(False)
+        # 暂停界面刷新，多个控件的状态变化合并为一次重绘
+        self.setUpdatesEnabled(False)
+        try:
+            self.proxy_type.setEnabled(enabled)
+            self.proxy_host.setEnabled(enabled)
+            self.proxy_port.setEnabled(enabled)
+            self.auth_group.setEnabled(enabled)
+            if not enabled:
+                self.auth_group.setChecked(False)
+        finally:
+            self.setUpdatesEnabled(True)
             
     def on_auth_enabled(self, enabled: bool):
         """认证启用状态变更处理"""
@@ -105,163 +315,116 @@ class ProxyDialog(QDialog):
             return
             
         # 创建进度对话框
-        progress = QProgressDialog("正在测试代理连接...", "取消", 0, len(self.TEST_URLS) + 1, self)
+        progress = QProgressDialog("正在测试代理连接...", "取消", 0, len(self.TEST_TARGETS) + 1, self)
         progress.setWindowTitle("连接测试")
         progress.setWindowModality(Qt.WindowModal)
         progress.setMinimumDuration(0)
         progress.setValue(0)
         
         # 准备代理配置
-        proxy_type = self.proxy_type.currentText().lower()
         proxy_host = self.proxy_host.text()
         proxy_port = self.proxy_port.value()
+        proxies = self._get_proxies()
+        headers = {'User-Agent': _USER_AGENT}
         
-        if self.auth_group.isChecked():
-            auth = f"{self.proxy_username.text()}:{self.proxy_password.text()}@"
-        else:
-            auth = ""
-            
-        proxy_url = f"{proxy_type}://{auth}{proxy_host}:{proxy_port}"
-        proxies = {
-            'http': proxy_url,
-            'https': proxy_url
-        }
-        
-        results = []
-        current_url_index = 0
+        # 测试在全局线程池中进行，结果通过信号回到界面线程
+        self._test_results = []
+        self._test_progress = progress
+        self._probe_signals = signals = _ProbeSignals()
+        signals.finished.connect(self._on_probe_done)
+        progress.canceled.connect(self._on_test_canceled)
+        self._progress_timer.start()
         
-        def test_url():
-            nonlocal current_url_index
+        # 代理服务器检测与外部连接测试同时进行，检测结果仅用于诊断
+        pool = QThreadPool.globalInstance()
+        pool.start(ProbeTask(_check_proxy_socket, (proxy_host, proxy_port, self.CONNECT_TIMEOUT), signals))
+        timeout = (self.CONNECT_TIMEOUT, self.READ_TIMEOUT)
+        for url in self.TEST_TARGETS:
+            pool.start(ProbeTask(_probe_url, (url, proxies, headers, timeout), signals))
             
-            # 首先测试代理服务器是否可访问
-            if current_url_index == 0:
-                import socket
-                try:
-                    # 创建socket连接测试代理服务器是否在线
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(5)
-                    result = sock.connect_ex((proxy_host, proxy_port))
-                    sock.close()
-                    
-                    if result != 0:
-                        results.append(("代理服务器", False, 
-                            f"代理服务器无法连接 (错误代码: {result})\n"
-                            f"请检查：\n"
-                            f"1. 代理服务器 {proxy_host}:{proxy_port} 是否已启动\n"
-                            f"2. 防火墙是否允许该连接\n"
-                            f"3. 代理服务器地址和端口是否正确"))
-                        progress.close()
-                        self.show_test_results(results)
-                        return
-                    else:
-                        results.append(("代理服务器", True, "代理服务器连接成功"))
-                except Exception as e:
-                    results.append(("代理服务器", False, f"连接代理服务器时出错: {str(e)}"))
-                    progress.close()
-                    self.show_test_results(results)
-                    return
-                    
-                current_url_index += 1
-                progress.setValue(current_url_index)
-                if not progress.wasCanceled():
-                    QTimer.singleShot(0, test_url)
-                return
-                
-            # 测试外部连接
-            if current_url_index > len(self.TEST_URLS) or progress.wasCanceled():
-                progress.close()
-                self.show_test_results(results)
-                return
-                
-            url = self.TEST_URLS[current_url_index - 1]
-            try:
-                session = requests.Session()
-                session.trust_env = False  # 禁用系统代理设置
-                
-                # 设置详细的请求选项
-                response = session.get(
-                    url,
-                    proxies=proxies,
-                    timeout=5,
-                    verify=True,  # 验证SSL证书
-                    allow_redirects=True,  # 允许重定向
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    }
-                )
-                
-                if response.status_code == 200:
-                    results.append((url, True, "连接成功"))
-                else:
-                    results.append((url, False, f"HTTP状态码: {response.status_code}"))
-                    
-            except requests.exceptions.ProxyError as e:
-                error_msg = str(e)
-                if "NewConnectionError" in error_msg:
-                    error_msg = (
-                        "无法连接到代理服务器。可能的原因：\n"
-                        "1. 代理服务器未运行或地址错误\n"
-                        "2. 代理服务器拒绝连接\n"
-                        "3. 防火墙阻止了连接"
-                    )
-                results.append((url, False, error_msg))
-            except requests.exceptions.SSLError:
-                results.append((url, False, "SSL证书验证失败"))
-            except requests.exceptions.Timeout:
-                results.append((url, False, "连接超时"))
-            except requests.exceptions.ConnectionError as e:
-                results.append((url, False, f"连接错误: {str(e)}"))
-            except Exception as e:
-                results.append((url, False, f"未知错误: {str(e)}"))
-                
-            current_url_index += 1
-            progress.setValue(current_url_index)
+    def _on_probe_done(self, kind: str, name: str, success: bool, detail: str):
+        """单项测试完成处理"""
+        # 忽略已取消或已被新测试替换的测试结果
+        if self.sender() is not self._probe_signals:
+            return
             
-            if not progress.wasCanceled():
-                QTimer.singleShot(0, test_url)
-                
-        # 开始测试
-        QTimer.singleShot(0, test_url)
+        results = self._test_results
+        results.append((kind, name, success, detail))
+        if len(results) < len(self.TEST_TARGETS) + 1:
+            return
+            
+        self._probe_signals = None
+        self._progress_timer.stop()
+        self._test_progress.close()
+        # 结果按完成顺序到达，显示时恢复为测试列表的顺序
+        order = {url: i for i, url in enumerate(self.TEST_TARGETS)}
+        results.sort(key=lambda r: order.get(r[1], -1))
+        self.show_test_results(results)
+        
+    def _update_test_progress(self):
+        """按已完成的测试数量刷新进度"""
+        if self._test_progress is not None:
+            self._test_progress.setValue(len(self._test_results))
+            
+    def _on_test_canceled(self):
+        """取消测试"""
+        self._probe_signals = None
+        self._progress_timer.stop()
         
     def show_test_results(self, results):
-        """显示测试结果"""
-        success_count = sum(1 for _, success, _ in results if success)
-        message = f"测试完成 ({success_count}/{len(results)} 成功):\n\n"
-        
-        # 首先显示代理服务器测试结果
-        proxy_result = next((r for r in results if r[0] == "代理服务器"), None)
-        if proxy_result:
-            status = "✓" if proxy_result[1] else "✗"
-            message += f"{status} {proxy_result[0]}\n"
-            if not proxy_result[1]:
-                message += f"   {proxy_result[2]}\n\n"
+        """显示测试结果
+        Args:
+            results: 测试结果列表 [(类型, 名称, 是否成功, 详情)]，类型为"proxy"或"url"
+        """
+        success_count = 0
+        proxy_parts = []
+        url_parts = []
+        
+        # 一次遍历分别整理代理服务器和外部连接的测试结果
+        for kind, name, success, detail in results:
+            status = "✓" if success else "✗"
+            if success:
+                success_count += 1
+            if kind == "proxy":
+                proxy_parts.append(f"{status} {name}\n")
+                proxy_parts.append("\n" if success else f"   {detail}\n\n")
             else:
-                message += "\n"
-                
-        # 然后显示外部连接测试结果
-        for url, success, detail in results:
-            if url != "代理服务器":
-                status = "✓" if success else "✗"
-                message += f"{status} {url}\n"
+                url_parts.append(f"{status} {name}\n")
                 if not success:
-                    message += f"   {detail}\n"
+                    url_parts.append(f"   {detail}\n")
+                    
+        # 首先显示代理服务器测试结果，然后显示外部连接测试结果
+        parts = [f"测试完成 ({success_count}/{len(results)} 成功):\n\n"]
+        parts.extend(proxy_parts)
+        parts.extend(url_parts)
+        message = "".join(parts)
                     
         if success_count == len(results):
             QMessageBox.information(self, "测试结果", message)
         else:
             QMessageBox.warning(self, "测试结果", message)
             
+    def done(self, result: int):
+        """关闭对话框时忽略仍在进行的测试的结果"""
+        self._probe_signals = None
+        self._progress_timer.stop()
+        super().done(result)
+        
     def get_proxy_config(self) -> dict:
         """获取代理配置"""
-        return {
-            'enabled': self.enable_proxy.isChecked(),
-            'type': self.proxy_type.currentText(),
-            'host': self.proxy_host.text(),
-            'port': self.proxy_port.value(),
-            'auth_enabled': self.auth_group.isChecked(),
-            'username': self.proxy_username.text() if self.auth_group.isChecked() else '',
-            'password': self.proxy_password.text() if self.auth_group.isChecked() else ''
-        }
+        if self._config_cache is None:
+            auth_enabled = self.auth_group.isChecked()
+            self._config_cache = {
+                'enabled': self.enable_proxy.isChecked(),
+                'type': self.proxy_type.currentText(),
+                'host': self.proxy_host.text(),
+                'port': self.proxy_port.value(),
+                'auth_enabled': auth_enabled,
+                'username': self.proxy_username.text() if auth_enabled else '',
+                'password': self.proxy_password.text() if auth_enabled else ''
+            }
+        # 返回副本，避免调用方修改缓存
+        return dict(self._config_cache)
         
     def set_proxy_config(self, config: dict):
         """设置代理配置"""
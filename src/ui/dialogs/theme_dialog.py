@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout,
-                            QPushButton, QListWidget, QListWidgetItem,
+                            QPushButton, QListWidget,
                             QLabel, QColorDialog, QFormLayout)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSignalBlocker
 from PyQt5.QtGui import QColor
 
 class ThemeDialog(QDialog):
@@ -38,14 +38,31 @@ class ThemeDialog(QDialog):
         }
     }
     
+    # 预定义主题颜色对应的QColor，类加载时解析一次
+    _PREDEFINED_QCOLORS = {value: QColor(value)
+                           for colors in PREDEFINED_THEMES.values()
+                           for value in colors.values()}
+    
+    # 按颜色配置反查预定义主题名称
+    _THEME_BY_FROZEN = {frozenset(colors.items()): name
+                        for name, colors in PREDEFINED_THEMES.items()}
+    
+    # 颜色按钮样式模板
+    _BTN_QSS = "QPushButton { background-color: %s; border: 1px solid #CCCCCC; }"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("主题设置")
         self.setMinimumWidth(500)
         self.setMinimumHeight(400)
         self.current_theme = {}
+        self._button_colors = {}  # 各颜色按钮当前显示的颜色
         self.init_ui()
         
+        # 复用同一个颜色选择对话框，避免每次选择颜色时重新创建
+        self._color_dialog = QColorDialog(self)
+        self._color_dialog.setOption(QColorDialog.ShowAlphaChannel, False)
+        
     def init_ui(self):
         """初始化UI"""
         layout = QHBoxLayout(self)
@@ -55,9 +72,7 @@ class ThemeDialog(QDialog):
         left_layout.addWidget(QLabel("预设主题:"))
         
         self.theme_list = QListWidget()
-        for theme_name in self.PREDEFINED_THEMES:
-            item = QListWidgetItem(theme_name)
-            self.theme_list.addItem(item)
+        self.theme_list.addItems(list(self.PREDEFINED_THEMES))
         self.theme_list.currentItemChanged.connect(self.on_theme_selected)
         left_layout.addWidget(self.theme_list)
         
@@ -117,23 +132,25 @@ class ThemeDialog(QDialog):
             
     def choose_color(self, color_name: str):
         """选择颜色"""
-        current_color = QColor(self.current_theme.get(color_name, "#000000"))
-        color = QColorDialog.getColor(current_color, self, f"选择{color_name}颜色")
+        value = self.current_theme.get(color_name, "#000000")
+        current_color = self._PREDEFINED_QCOLORS.get(value) or QColor(value)
+        self._color_dialog.setWindowTitle(f"选择{color_name}颜色")
+        self._color_dialog.setCurrentColor(current_color)
         
-        if color.isValid():
-            self.current_theme[color_name] = color.name()
-            self.update_color_buttons()
+        if self._color_dialog.exec_() == QDialog.Accepted:
+            color = self._color_dialog.currentColor()
+            if color.isValid():
+                self.current_theme[color_name] = color.name()
+                self.update_color_buttons()
             
     def update_color_buttons(self):
         """更新颜色按钮显示"""
         for name, btn in self.color_buttons.items():
             color = self.current_theme.get(name, "#000000")
-            btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {color};
-                    border: 1px solid #CCCCCC;
-                }}
-            """)
+            # 颜色未变化时不重新设置样式表，避免Qt重新解析
+            if self._button_colors.get(name) != color:
+                btn.setStyleSheet(self._BTN_QSS % color)
+                self._button_colors[name] = color
             
     def get_theme_config(self) -> dict:
         """获取主题配置"""
@@ -145,9 +162,11 @@ class ThemeDialog(QDialog):
         self.update_color_buttons()
         
         # 查找匹配的预定义主题
-        for theme_name, theme_colors in self.PREDEFINED_THEMES.items():
-            if theme_colors == config:
-                # 选中对应的列表项
-                items = self.theme_list.findItems(theme_name, Qt.MatchExactly)
-                if items:
-                    self.theme_list.setCurrentItem(items[0]) 
\ No newline at end of file
+        theme_name = self._THEME_BY_FROZEN.get(frozenset(config.items()))
+        if theme_name:
+            # 选中对应的列表项
+            items = self.theme_list.findItems(theme_name, Qt.MatchExactly)
+            if items:
+                # 阻止选择信号，避免预设主题覆盖刚设置的配置
+                with QSignalBlocker(self.theme_list):
+                    self.theme_list.setCurrentItem(items[0])
\ No newline at end of file
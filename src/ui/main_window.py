@@ -1,16 +1,20 @@
 import os
 import sys
+import re
+import time
+import json
+from collections import deque, OrderedDict
 from typing import Dict, List, Optional
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                            QPushButton, QLabel, QLineEdit, QTableWidget,
-                            QTableWidgetItem, QMessageBox, QComboBox, QMenu,
+                            QPushButton, QLabel, QLineEdit, QTableView,
+                            QMessageBox, QComboBox, QMenu,
                             QAction, QStatusBar, QToolBar, QDialog, QFormLayout,
                             QSpinBox, QCheckBox, QToolTip, QHeaderView, QProgressBar,
                             QFileDialog, QListWidget, QListWidgetItem, QInputDialog,
                             QTextEdit, QGroupBox, QActionGroup, QScrollArea)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QIcon, QCursor
-from datetime import datetime
+from PyQt5.QtCore import (Qt, QObject, QThread, pyqtSignal, QTimer, QThreadPool,
+                          QSortFilterProxyModel, QRunnable)
+from PyQt5.QtGui import QIcon, QCursor, QColor
 import logging
 
 from src.core.package_manager import PackageManager
@@ -21,6 +25,205 @@ from src.ui.dialogs.create_env_dialog import CreateEnvDialog
 from src.ui.dialogs.install_package_dialog import InstallPackageDialog
 from src.ui.dialogs.proxy_dialog import ProxyDialog
 from src.ui.dialogs.theme_dialog import ThemeDialog
+from src.ui.package_model import PackageModel
+
+# 应用数据目录，导入时计算一次
+if os.name == 'nt':
+    _APP_DATA = os.path.join(os.environ.get('APPDATA') or os.path.expanduser('~'), 'PipManager')
+else:
+    _APP_DATA = os.path.join(os.path.expanduser('~'), '.pipmanager')
+
+# 各级别通知的样式
+_NOTIF_STYLES = {
+    "info": "background-color: #e3f2fd; color: #0d47a1; padding: 5px; border-radius: 3px;",
+    "warning": "background-color: #fff3e0; color: #e65100; padding: 5px; border-radius: 3px;",
+    "error": "background-color: #ffebee; color: #c62828; padding: 5px; border-radius: 3px;"
+}
+_NOTIF_DEFAULT = _NOTIF_STYLES["info"]
+_TS_STYLE = "color: gray; font-size: 10px;"  # 通知时间戳样式
+
+# 主题样式表模板，$bg/$text/$primary/$secondary为主题颜色
+_THEME_QSS = """
+    QMainWindow, QDialog {
+        background-color: $bg;
+        color: $text;
+    }
+    
+    QPushButton {
+        background-color: $primary;
+        color: white;
+        border: none;
+        padding: 5px 10px;
+        border-radius: 3px;
+    }
+    
+    QPushButton:hover {
+        background-color: $secondary;
+    }
+    
+    QPushButton:disabled {
+        background-color: #CCCCCC;
+        color: #666666;
+    }
+    
+    QTableView {
+        background-color: $bg;
+        color: $text;
+        gridline-color: $secondary;
+        border: 1px solid $secondary;
+    }
+    
+    QTableView::item:selected {
+        background-color: $primary;
+        color: white;
+    }
+    
+    QHeaderView::section {
+        background-color: $secondary;
+        color: white;
+        padding: 5px;
+        border: none;
+    }
+    
+    QLineEdit, QComboBox, QSpinBox {
+        background-color: $bg;
+        color: $text;
+        border: 1px solid $secondary;
+        padding: 5px;
+        border-radius: 3px;
+    }
+    
+    QComboBox::drop-down {
+        border: none;
+        background-color: $primary;
+        width: 20px;
+    }
+    
+    QComboBox::down-arrow {
+        width: 12px;
+        height: 12px;
+        background: white;
+    }
+    
+    QCheckBox {
+        color: $text;
+    }
+    
+    QCheckBox::indicator {
+        width: 15px;
+        height: 15px;
+    }
+    
+    QCheckBox::indicator:checked {
+        background-color: $primary;
+        border: 2px solid $primary;
+    }
+    
+    QCheckBox::indicator:unchecked {
+        background-color: white;
+        border: 2px solid $secondary;
+    }
+    
+    QMenu {
+        background-color: $bg;
+        color: $text;
+        border: 1px solid $secondary;
+    }
+    
+    QMenu::item:selected {
+        background-color: $primary;
+        color: white;
+    }
+    
+    QScrollBar:vertical {
+        background-color: $bg;
+        width: 12px;
+        margin: 0px;
+    }
+    
+    QScrollBar::handle:vertical {
+        background-color: $secondary;
+        min-height: 20px;
+        border-radius: 6px;
+    }
+    
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    """
+
+# 导入时将模板拆分为固定片段和颜色变量位置，生成样式表时只需填入颜色后拼接
+_THEME_VARS = ('bg', 'text', 'primary', 'secondary')
+_THEME_DEFAULTS = (('background', '#FFFFFF'), ('text', '#000000'),
+                   ('primary', '#1976D2'), ('secondary', '#424242'))  # 配置项及默认颜色，与_THEME_VARS对应
+_THEME_PARTS = re.split(r'\$(\w+)', _THEME_QSS)
+_THEME_VAR_IDX = tuple((i, _THEME_VARS.index(name))
+                       for i, name in enumerate(_THEME_PARTS) if i % 2)
+
+def _render_theme(colors: tuple) -> str:
+    """按主题颜色生成样式表
+    Args:
+        colors: (背景色, 文字色, 主色, 次色)
+    Returns:
+        str: 样式表
+    """
+    parts = list(_THEME_PARTS)
+    for i, color_idx in _THEME_VAR_IDX:
+        parts[i] = colors[color_idx]
+    return "".join(parts)
+
+def _theme_colors(config: dict) -> tuple:
+    """读取主题配置中的颜色，无效的颜色使用默认值
+    Args:
+        config: 主题配置
+    Returns:
+        tuple: (背景色, 文字色, 主色, 次色)
+    """
+    colors = []
+    for name, default in _THEME_DEFAULTS:
+        value = config.get(name, default)
+        if not isinstance(value, str) or not QColor.isValidColor(value):
+            logging.warning(f"无效的主题颜色 {name}: {value!r}，使用默认值 {default}")
+            value = default
+        colors.append(sys.intern(value))
+    return tuple(colors)
+
+class _SettingsSignals(QObject):
+    """将后台读取的设置传回界面线程"""
+    loaded = pyqtSignal(object, object)  # 设置读取完成信号(代理配置, 主题配置)
+
+class SettingsLoadTask(QRunnable):
+    """在线程池中读取代理和主题配置
+    
+    直接读取配置文件，不访问ConfigManager的缓存，界面线程可同时使用ConfigManager
+    """
+    
+    def __init__(self, proxy_path: str, theme_path: str, signals: _SettingsSignals):
+        """初始化任务
+        Args:
+            proxy_path: 代理配置文件路径
+            theme_path: 主题配置文件路径
+            signals: 用于返回结果的信号对象
+        """
+        super().__init__()
+        self._paths = (proxy_path, theme_path)
+        self._signals = signals
+        
+    @staticmethod
+    def _read(path: str) -> Optional[dict]:
+        """读取配置文件，文件不存在或无法解析时返回None"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"读取配置文件 {path} 失败: {str(e)}")
+            return None
+            
+    def run(self):
+        """读取配置"""
+        self._signals.loaded.emit(*(self._read(path) for path in self._paths))
 
 class MainWindow(QMainWindow):
     """主窗口类"""
@@ -38,6 +241,15 @@ class MainWindow(QMainWindow):
             
             # 保存配置管理器实例
             self.config_manager = config_manager
+            self._last_style = ""  # 当前已应用的样式表
+            self._theme_cache = OrderedDict()  # 主题颜色 -> 样式表
+            self._config_cache: Dict[str, dict] = {}  # 配置名称 -> 已读取的配置
+            self._last_proxy: Optional[dict] = None  # 上次应用的代理配置
+            self._proxy_env: Dict[str, str] = {}  # 本程序设置的代理环境变量
+            self._pending_configs: Dict[str, dict] = {}  # 配置名称 -> 待保存的配置
+            
+            # 在后台读取设置，与界面创建同时进行，读取完成后再应用主题并加载环境列表
+            self._async_load_settings()
             
             # 初始化管理器（在UI之前）
             self.init_managers()
@@ -45,11 +257,10 @@ class MainWindow(QMainWindow):
             # 初始化UI
             self.setup_ui()
             
-            # 加载设置
-            self.load_settings()
-            
-            # 刷新环境列表
-            self.refresh_env_list()
+            # 对话框修改的配置延迟合并写入磁盘
+            self._flush_timer = QTimer(self)
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.timeout.connect(self._flush_configs)
             
             self.logger.info("主窗口初始化完成")
             
@@ -61,18 +272,26 @@ class MainWindow(QMainWindow):
         """初始化各个管理器"""
         try:
             # 获取应用数据目录
-            app_data = os.path.join(os.environ['APPDATA'], 'PipManager') if os.name == 'nt' else os.path.join(os.path.expanduser('~'), '.pipmanager')
+            app_data = _APP_DATA
+            self.cache_dir = os.path.join(app_data, 'cache')
         
             # 初始化环境管理器
             self.env_manager = EnvManager(app_data)
+            self.env_manager.env_created.connect(self.on_env_created)
+            self.env_manager.env_create_error.connect(self.on_env_create_error)
             self.logger.info("环境管理器初始化完成")
         
             # 初始化镜像源管理器
             self.mirror_manager = MirrorManager(self.config_manager)
+            self.mirror_manager.speed_test_finished.connect(self.on_speed_test_finished)
+            self.mirror_manager.speed_test_error.connect(self.on_speed_test_error)
+            self.mirror_manager.operation_error.connect(self.on_mirror_error)
+            self._speed_test_in_progress = False
             self.logger.info("镜像源管理器初始化完成")
         
             # 初始化包管理器
             self.package_manager = None  # 将在选择环境后初始化
+            self._pm_conns = []  # 当前包管理器的信号连接
         
         except Exception as e:
             self.logger.error(f"初始化管理器时出错: {str(e)}")
@@ -136,9 +355,10 @@ class MainWindow(QMainWindow):
             # 添加镜像源操作按钮
             mirror_menu = QMenu()
             
-            # 创建切换镜像源子菜单
+            # 创建切换镜像源子菜单，在菜单显示前才生成镜像源列表
             self.switch_mirror_menu = QMenu("切换镜像源")
-            self.update_mirror_menu()  # 更新镜像源列表
+            self._mirror_menu_dirty = True
+            self.switch_mirror_menu.aboutToShow.connect(self.update_mirror_menu)
             mirror_menu.addMenu(self.switch_mirror_menu)
             
             mirror_menu.addSeparator()
@@ -202,9 +422,15 @@ class MainWindow(QMainWindow):
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("搜索包...")
-        self.search_input.textChanged.connect(self.filter_packages)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
         search_layout.addWidget(self.search_input)
         
+        # 输入停止一段时间后再过滤，连续输入只过滤一次
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self.filter_packages)
+        
         # 高级搜索按钮
         advanced_btn = QPushButton("高级搜索")
         advanced_btn.clicked.connect(self.show_advanced_search)
@@ -222,10 +448,16 @@ class MainWindow(QMainWindow):
         
         package_layout.addLayout(search_layout)
         
-        # 包列表表格
-        self.package_table = QTableWidget()
-        self.package_table.setColumnCount(5)
-        self.package_table.setHorizontalHeaderLabels(["包名", "当前版本", "最新版本", "位置", "安装时间"])
+        # 包列表表格，通过代理模型按包名过滤
+        self._last_packages: Dict[str, dict] = {}  # 最近一次加载的包信息
+        self._pkg_model = PackageModel(self)
+        self._pkg_proxy = QSortFilterProxyModel(self)
+        self._pkg_proxy.setSourceModel(self._pkg_model)
+        self._pkg_proxy.setFilterKeyColumn(0)
+        self._pkg_proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        
+        self.package_table = QTableView()
+        self.package_table.setModel(self._pkg_proxy)
         self.package_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.package_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.package_table.customContextMenuRequested.connect(self.show_context_menu)
@@ -236,6 +468,13 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         package_layout.addWidget(self.progress_bar)
         
+        # 进度更新最多每50毫秒刷新一次进度条
+        self._pending_progress = 0
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(50)
+        self._progress_timer.timeout.connect(self._apply_progress)
+        
         # 设置包列表区域的拉伸因子为7
         parent_layout.addWidget(package_group, 7)
         
@@ -258,6 +497,12 @@ class MainWindow(QMainWindow):
         self.notification_layout = QVBoxLayout(self.notification_container)
         self.notification_layout.setAlignment(Qt.AlignTop)
         
+        # 最多保留的通知数量，超出时复用最早的通知控件
+        self._notif_ring = deque(maxlen=100)  # 显示中的通知 [容器, 消息标签, 时间戳标签, 级别]
+        self._notif_free = []  # 清除后可复用的通知控件
+        self._last_notification = None  # (消息, 级别, 时间戳标签)
+        self._last_ts = (0, "")  # (秒级时间戳, 格式化后的时间)
+        
         scroll_area.setWidget(self.notification_container)
         notification_layout.addWidget(scroll_area)
         
@@ -269,24 +514,58 @@ class MainWindow(QMainWindow):
         # 设置通知区域的拉伸因子为3
         parent_layout.addWidget(notification_group, 3)
         
-    def delayed_init(self):
-        """延迟初始化"""
-        # 加载环境列表
+    def _async_load_settings(self):
+        """在后台线程中读取设置，读取完成后由_on_settings_loaded应用"""
+        # 信号对象随窗口存在，任务结束前不会被回收
+        self._settings_signals = _SettingsSignals(self)
+        self._settings_signals.loaded.connect(self._on_settings_loaded)
+        QThreadPool.globalInstance().start(SettingsLoadTask(
+            self.config_manager.get_config_path('proxy'),
+            self.config_manager.get_config_path('theme'),
+            self._settings_signals
+        ))
+        
+    def _on_settings_loaded(self, proxy_config: Optional[dict], theme_config: Optional[dict]):
+        """后台读取设置完成处理"""
+        # 读取期间已在对话框中修改的配置优先
+        self._cache_settings(proxy_config, theme_config)
+        self._apply_settings(self._config_cache.get('proxy'), self._config_cache.get('theme'))
+        
+        # 代理设置应用后再加载环境列表，保证首次调用pip时代理已生效
         self.refresh_env_list()
         
-        # 加载设置
-        self.load_settings()
-        
-    def load_settings(self):
-        """加载设置"""
+    def _cache_settings(self, proxy_config: Optional[dict], theme_config: Optional[dict]):
+        """记录已读取的代理和主题配置，打开设置对话框时不再重复读取"""
+        for name, config in (('proxy', proxy_config), ('theme', theme_config)):
+            if config is not None and name not in self._config_cache:
+                self._config_cache[name] = config
+                
+    def _get_cached_config(self, name: str) -> Optional[dict]:
+        """获取配置，优先使用已读取或尚未写入磁盘的配置
+        Args:
+            name: 配置名称
+        Returns:
+            Optional[dict]: 配置数据
+        """
+        config = self._config_cache.get(name)
+        if config is None:
+            config = self.config_manager.load_config(name)
+            if config is not None:
+                self._config_cache[name] = config
+        return config
+        
+    def _apply_settings(self, proxy_config: Optional[dict], theme_config: Optional[dict]):
+        """应用代理和主题设置
+        Args:
+            proxy_config: 代理配置
+            theme_config: 主题配置，为空时使用默认浅色主题
+        """
         try:
             # 加载代理设置
-            proxy_config = self.config_manager.load_config('proxy')
             if proxy_config:
                 self.apply_proxy_settings(proxy_config)
             
             # 加载主题设置
-            theme_config = self.config_manager.load_config('theme')
             if theme_config:
                 self.apply_theme(theme_config)
             else:
@@ -318,6 +597,16 @@ class MainWindow(QMainWindow):
         try:
             # 保存所有设置
             self.save_settings()
+            self._flush_configs()
+            self.env_manager.flush()
+            self.mirror_manager.flush()
+            self.config_manager.flush()
+            
+            # 取消包管理器的后台任务并断开信号，超时后仍在运行的任务发出的信号会被丢弃
+            self._release_package_manager()
+            self.mirror_manager.speed_test_finished.disconnect(self.on_speed_test_finished)
+            self.mirror_manager.speed_test_error.disconnect(self.on_speed_test_error)
+            QThreadPool.globalInstance().waitForDone(3000)
             event.accept()
         except Exception as e:
             self.logger.error(f"关闭窗口时出错: {str(e)}")
@@ -325,83 +614,146 @@ class MainWindow(QMainWindow):
         
     def refresh_env_list(self):
         """刷新环境列表"""
-        self.env_combo.clear()
+        current_env = self.env_combo.currentText()
         envs = self.env_manager.get_env_list()
-        self.env_combo.addItems(envs)
+        
+        # 重建列表时屏蔽信号，避免中间状态触发环境切换
+        self.env_combo.blockSignals(True)
+        try:
+            self.env_combo.clear()
+            self.env_combo.addItems(envs)
+            if current_env in envs:
+                self.env_combo.setCurrentText(current_env)
+        finally:
+            self.env_combo.blockSignals(False)
+            
+        # 当前环境不再存在时切换到新的当前环境
+        if self.env_combo.currentText() != current_env:
+            self.on_env_changed(self.env_combo.currentText())
         
     def on_env_changed(self, env_name: str):
         """环境变更处理"""
         if not env_name:
             return
             
-        # 获取环境Python路径
+        # 获取环境Python路径，环境管理器已缓存并校验该路径
         python_path = self.env_manager.get_env_python_path(env_name)
         if not python_path:
             QMessageBox.warning(self, "错误", f"无法获取环境 {env_name} 的Python路径")
             self.add_notification(f"无法获取环境 {env_name} 的Python路径", "error")
             return
             
-        # 初始化包管理器
-        self.package_manager = PackageManager(python_path, env_name)
-        self.package_manager.package_loaded.connect(self.on_packages_loaded)
-        self.package_manager.package_load_error.connect(self.on_package_load_error)
-        self.package_manager.progress_updated.connect(self.update_progress)
-        self.package_manager.package_installed.connect(self.on_package_installed)
-        self.package_manager.package_install_error.connect(self.on_package_install_error)
-        self.package_manager.package_uninstalled.connect(self.on_package_uninstalled)
-        self.package_manager.package_uninstall_error.connect(self.on_package_uninstall_error)
-        self.package_manager.package_upgraded.connect(self.on_package_upgraded)
-        self.package_manager.package_upgrade_error.connect(self.on_package_upgrade_error)
+        # 初始化包管理器，旧环境尚未完成的后台任务不再更新界面
+        self._release_package_manager()
+        try:
+            self.package_manager = PackageManager(python_path, env_name, self.cache_dir)
+        except ValueError as e:
+            # 解释器无法运行时不再操作旧环境，清空包列表
+            self.package_manager = None
+            self._last_packages = {}
+            self._pkg_model.reset_with({})
+            QMessageBox.warning(self, "错误", f"无法初始化环境 {env_name}: {str(e)}")
+            self.add_notification(f"无法初始化环境 {env_name}: {str(e)}", "error")
+            return
+        self._connect_package_manager(self.package_manager)
         
         # 加载包列表
         self.load_packages()
         self.add_notification(f"已切换到环境: {env_name}", "info")
         
+    def _connect_package_manager(self, manager: PackageManager):
+        """连接包管理器的信号，并保存连接以便切换环境时断开"""
+        self._pm_conns = [signal.connect(slot) for signal, slot in (
+            (manager.package_loaded, self.on_packages_loaded),
+            (manager.packages_changed, self.on_packages_changed),
+            (manager.package_load_error, self.on_package_load_error),
+            (manager.progress_updated, self.update_progress),
+            (manager.package_installed, self.on_package_installed),
+            (manager.package_install_error, self.on_package_install_error),
+            (manager.package_uninstalled, self.on_package_uninstalled),
+            (manager.package_uninstall_error, self.on_package_uninstall_error),
+            (manager.package_upgraded, self.on_package_upgraded),
+            (manager.package_upgrade_error, self.on_package_upgrade_error)
+        )]
+        
+    def _release_package_manager(self):
+        """取消当前包管理器的后台任务并断开其信号连接"""
+        if not self.package_manager:
+            return
+        self.package_manager.cancel()
+        for conn in self._pm_conns:
+            QObject.disconnect(conn)
+        self._pm_conns = []
+        
     def load_packages(self):
         """加载包列表"""
         if not self.package_manager:
             return
             
+        if not self.package_manager.load_packages_async():
+            return
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        
+    def refresh_packages(self):
+        """增量刷新包列表，只更新变化的行"""
+        if not self.package_manager:
+            return
+            
+        # 已有后台任务时刷新会在其结束后执行
+        self.package_manager.refresh_packages_async()
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
-        self.package_manager.load_packages()
+        
+    def _current_package_name(self) -> Optional[str]:
+        """获取当前选中行的包名，未选中时返回None"""
+        index = self.package_table.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(Qt.UserRole)
         
     def on_packages_loaded(self, package_info: Dict[str, dict]):
         """包加载完成处理"""
-        self.package_table.setRowCount(0)
+        # 包列表未变化时只刷新内容变化的行，否则整体替换，视图只刷新一次
+        # 信号传递的是包管理器自己的字典，保存副本，之后的增删不影响后台线程
+        self._last_packages = dict(package_info)
+        self._pkg_model.update_with(package_info)
         
-        for name, info in package_info.items():
-            row = self.package_table.rowCount()
-            self.package_table.insertRow(row)
-            
-            self.package_table.setItem(row, 0, QTableWidgetItem(name))
-            self.package_table.setItem(row, 1, QTableWidgetItem(info['version']))
-            self.package_table.setItem(row, 2, QTableWidgetItem(info.get('latest_version', '')))
-            self.package_table.setItem(row, 3, QTableWidgetItem(info['location']))
-            self.package_table.setItem(row, 4, QTableWidgetItem(info['install_time'] or ''))
-            
         self.progress_bar.setVisible(False)
         self.add_notification(f"已加载 {len(package_info)} 个包", "info")
         
+    def on_packages_changed(self, changed: Dict[str, dict], removed: List[str]):
+        """增量刷新完成处理，只更新、追加或删除变化的行"""
+        for name in removed:
+            self._last_packages.pop(name, None)
+            self._pkg_model.remove_package(name)
+        self._last_packages.update(changed)
+        self._pkg_model.upsert_packages(changed)
+        
+        self.progress_bar.setVisible(False)
+        
     def on_package_load_error(self, error_msg: str):
         """包加载错误处理"""
         self.progress_bar.setVisible(False)
         self.add_notification(error_msg, "error")
         
     def update_progress(self, progress: int):
-        """更新进度条"""
-        self.progress_bar.setValue(progress)
+        """更新进度条，短时间内的多次更新合并为一次"""
+        self._pending_progress = progress
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+            
+    def _apply_progress(self):
+        """将最新的进度显示到进度条"""
+        self.progress_bar.setValue(self._pending_progress)
+        
+    def on_search_text_changed(self, text: str):
+        """搜索文本变更处理，重新开始过滤计时"""
+        self._filter_timer.start()
         
     def filter_packages(self):
         """过滤包列表"""
-        search_text = self.search_input.text().lower()
-        
-        for row in range(self.package_table.rowCount()):
-            name_item = self.package_table.item(row, 0)
-            if name_item and search_text in name_item.text().lower():
-                self.package_table.setRowHidden(row, False)
-            else:
-                self.package_table.setRowHidden(row, True)
+        self._pkg_proxy.setFilterFixedString(self.search_input.text())
                 
     def show_context_menu(self, position):
         """显示右键菜单"""
@@ -430,16 +782,26 @@ class MainWindow(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             env_info = dialog.get_env_info()
             
+            # 在后台创建环境，完成后由on_env_created处理
             if self.env_manager.create_env(
                 env_info['name'],
                 env_info['path'],
-                env_info['description']
+                env_info['description'],
+                blocking=False
             ):
-                self.refresh_env_list()
-                self.env_combo.setCurrentText(env_info['name'])
-                self.add_notification(f"已创建环境: {env_info['name']}", "info")
+                self.add_notification(f"正在创建环境: {env_info['name']}", "info")
             else:
                 self.add_notification(f"创建环境失败: {env_info['name']}", "error")
+                
+    def on_env_created(self, env_name: str):
+        """环境创建完成处理"""
+        self.refresh_env_list()
+        self.env_combo.setCurrentText(env_name)
+        self.add_notification(f"已创建环境: {env_name}", "info")
+        
+    def on_env_create_error(self, error_msg: str):
+        """环境创建错误处理"""
+        self.add_notification(error_msg, "error")
             
     def import_env(self):
         """导入环境"""
@@ -504,7 +866,7 @@ class MainWindow(QMainWindow):
         """包安装完成处理"""
         self.progress_bar.setVisible(False)
         self.add_notification(f"包 {package_name} 安装完成", "info")
-        self.load_packages()  # 刷新包列表
+        self.refresh_packages()  # 只刷新新增和变化的包
         
     def on_package_install_error(self, error_msg: str):
         """包安装错误处理"""
@@ -515,7 +877,10 @@ class MainWindow(QMainWindow):
         """包卸载完成处理"""
         self.progress_bar.setVisible(False)
         self.add_notification(f"包 {package_name} 卸载完成", "info")
-        self.load_packages()
+        
+        # 卸载不会新增其他包，直接删除对应的行，无需重新加载包列表
+        self._last_packages.pop(package_name, None)
+        self._pkg_model.remove_package(package_name)
         
     def on_package_uninstall_error(self, error_msg: str):
         """包卸载错误处理"""
@@ -526,7 +891,7 @@ class MainWindow(QMainWindow):
         """包更新完成处理"""
         self.progress_bar.setVisible(False)
         self.add_notification(f"包 {package_name} 更新完成", "info")
-        self.load_packages()
+        self.refresh_packages()
         
     def on_package_upgrade_error(self, error_msg: str):
         """包更新错误处理"""
@@ -539,12 +904,10 @@ class MainWindow(QMainWindow):
             self.add_notification("请先选择环境", "warning")
             return
             
-        current_row = self.package_table.currentRow()
-        if current_row < 0:
+        name = self._current_package_name()
+        if not name:
             self.add_notification("请先选择要卸载的包", "warning")
             return
-            
-        name = self.package_table.item(current_row, 0).text()
         
         reply = QMessageBox.question(
             self, "确认卸载",
@@ -567,12 +930,10 @@ class MainWindow(QMainWindow):
             self.add_notification("请先选择环境", "warning")
             return
             
-        current_row = self.package_table.currentRow()
-        if current_row < 0:
+        name = self._current_package_name()
+        if not name:
             self.add_notification("请先选择要更新的包", "warning")
             return
-            
-        name = self.package_table.item(current_row, 0).text()
         
         # 开始更新包
         self.progress_bar.setVisible(True)
@@ -596,16 +957,10 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            # 获取所有已安装的包
-            packages = []
-            for row in range(self.package_table.rowCount()):
-                name = self.package_table.item(row, 0).text()
-                version = self.package_table.item(row, 1).text()
-                packages.append(f"{name}=={version}")
-                
-            # 写入文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(packages))
+            # 直接使用已加载的包信息写入文件
+            with open(file_path, 'w', encoding='utf-8', newline='\n', buffering=1 << 20) as f:
+                f.write('\n'.join(f"{name}=={info['version']}"
+                                  for name, info in self._last_packages.items()))
                 
             self.add_notification(f"已导出requirements到: {file_path}", "info")
             
@@ -625,16 +980,10 @@ class MainWindow(QMainWindow):
             return
             
         try:
-            # 读取requirements文件
+            # 逐行读取requirements文件，忽略空行和注释
             with open(file_path, 'r', encoding='utf-8') as f:
-                requirements = f.readlines()
-            
-            # 解析包名和版本
-            packages = []
-            for line in requirements:
-                line = line.strip()
-                if line and not line.startswith('#'):  # 忽略空行和注释
-                    packages.append(line)
+                packages = [line for line in (raw.strip() for raw in f)
+                            if line and not line.startswith('#')]
             
             if not packages:
                 self.add_notification("requirements文件为空", "warning")
@@ -653,36 +1002,34 @@ class MainWindow(QMainWindow):
                 self.progress_bar.setVisible(True)
                 self.progress_bar.setValue(0)
                 
-                # 逐个安装包
-                total = len(packages)
-                for i, package in enumerate(packages, 1):
-                    self.add_notification(f"正在安装 ({i}/{total}): {package}", "info")
-                    if not self.package_manager.install_package(package):
-                        self.add_notification(f"安装失败: {package}", "error")
-                    self.progress_bar.setValue(int(i * 100 / total))
-                
-                self.progress_bar.setVisible(False)
-                self.add_notification("requirements导入完成", "info")
-                self.load_packages()  # 刷新包列表
+                # 在后台通过一次pip install -r安装，完成后由on_package_installed刷新包列表
+                if self.package_manager.install_requirements_async(file_path, len(packages)):
+                    self.add_notification(f"正在安装 {len(packages)} 个包", "info")
+                else:
+                    self.add_notification("正在执行其他操作，请稍后再试", "warning")
+                    self.progress_bar.setVisible(False)
                 
         except Exception as e:
             self.add_notification(f"导入requirements失败: {str(e)}", "error")
             self.progress_bar.setVisible(False)
         
     def update_mirror_menu(self):
-        """更新镜像源菜单"""
-        if not hasattr(self, 'switch_mirror_menu'):
+        """更新镜像源菜单，镜像源或当前镜像源变化后才重新生成"""
+        if not self._mirror_menu_dirty:
             return
+        self._mirror_menu_dirty = False
             
         self.switch_mirror_menu.clear()
         current_mirror = self.mirror_manager.get_current_mirror()
+        official_name = self.mirror_manager.OFFICIAL_MIRROR[0]
+        first_name = None
         
         # 添加所有镜像源到菜单
         for name, url in self.mirror_manager.get_mirror_list():
             # 为官方源添加分隔线
-            if name != self.mirror_manager.OFFICIAL_MIRROR[0] and \
-               self.switch_mirror_menu.actions() and \
-               self.switch_mirror_menu.actions()[0].text() == self.mirror_manager.OFFICIAL_MIRROR[0]:
+            if first_name is None:
+                first_name = name
+            elif name != official_name and first_name == official_name:
                 self.switch_mirror_menu.addSeparator()
                 
             action = self.switch_mirror_menu.addAction(name)
@@ -690,9 +1037,14 @@ class MainWindow(QMainWindow):
             if current_mirror and current_mirror[0] == name:
                 action.setChecked(True)
             # 为官方源添加提示
-            if name == self.mirror_manager.OFFICIAL_MIRROR[0]:
+            if name == official_name:
                 action.setToolTip("使用PyPI官方源（国外服务器，速度可能较慢）")
-            action.triggered.connect(lambda checked, n=name: self.switch_mirror(n))
+            action.setData(name)
+            action.triggered.connect(self._on_switch_mirror_triggered)
+            
+    def _on_switch_mirror_triggered(self, checked: bool):
+        """镜像源菜单项点击处理，镜像源名称保存在菜单项数据中"""
+        self.switch_mirror(self.sender().data())
             
     def switch_mirror(self, name: str):
         """切换镜像源"""
@@ -704,12 +1056,12 @@ class MainWindow(QMainWindow):
                 QMessageBox.Yes | QMessageBox.No
             )
             if reply != QMessageBox.Yes:
-                self.update_mirror_menu()  # 恢复之前的选中状态
+                self._mirror_menu_dirty = True  # 下次显示时恢复之前的选中状态
                 return
                 
         if self.mirror_manager.set_current_mirror(name):
             self.add_notification(f"已切换到镜像源: {name}", "info")
-            self.update_mirror_menu()  # 更新菜单选中状态
+            self._mirror_menu_dirty = True  # 下次显示时更新菜单选中状态
         
     def reset_mirror(self):
         """重置为默认镜像源"""
@@ -722,7 +1074,7 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             if self.mirror_manager.reset_to_default():
                 self.add_notification("已重置为默认镜像源", "info")
-                self.update_mirror_menu()  # 更新镜像源菜单
+                self._mirror_menu_dirty = True  # 下次显示时更新镜像源菜单
                 
     def add_mirror(self):
         """添加镜像源"""
@@ -740,7 +1092,7 @@ class MainWindow(QMainWindow):
             
         if self.mirror_manager.add_mirror(name, url):
             self.add_notification(f"已添加镜像源: {name}", "info")
-            self.update_mirror_menu()  # 更新镜像源菜单
+            self._mirror_menu_dirty = True  # 下次显示时更新镜像源菜单
                     
     def remove_mirror(self):
         """删除镜像源"""
@@ -765,7 +1117,7 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             if self.mirror_manager.remove_mirror(name):
                 self.add_notification(f"已删除镜像源: {name}", "info")
-                self.update_mirror_menu()  # 更新镜像源菜单
+                self._mirror_menu_dirty = True  # 下次显示时更新镜像源菜单
         
     def test_mirror_speed(self):
         """测试镜像源速度"""
@@ -774,70 +1126,108 @@ class MainWindow(QMainWindow):
             self.add_notification("没有可测试的镜像源", "warning")
             return
             
+        # 在后台线程中测速，结果由on_speed_test_finished处理
+        if self._speed_test_in_progress or not self.mirror_manager.test_mirror_speed_async():
+            self.add_notification("镜像源速度测试正在进行中", "warning")
+            return
+        self._speed_test_in_progress = True
+            
         self.add_notification("正在测试镜像源速度...", "info")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         
-        def on_speed_test_finished(results):
-            self.progress_bar.setVisible(False)
-            if not results:
-                self.add_notification("镜像源速度测试失败", "error")
-                return
-                
-            # 显示测试结果
-            result_text = "镜像源速度测试结果:\n\n"
-            for name, url, delay in results:
-                if delay == float('inf'):
-                    result_text += f"{name}: 连接失败\n"
-                else:
-                    result_text += f"{name}: {delay:.2f}ms\n"
-                    
-            QMessageBox.information(self, "测速结果", result_text)
-            self.add_notification("镜像源速度测试完成", "info")
+    def on_speed_test_finished(self, results: list):
+        """镜像源测速完成处理"""
+        if not self._speed_test_in_progress:
+            return
+        self._speed_test_in_progress = False
+        
+        self.progress_bar.setVisible(False)
+        if not results:
+            self.add_notification("镜像源速度测试失败", "error")
+            return
             
-        # 连接信号
-        self.mirror_manager.speed_test_finished.connect(on_speed_test_finished)
-        self.mirror_manager.test_mirror_speed()
-        # 测试完成后断开信号
-        self.mirror_manager.speed_test_finished.disconnect(on_speed_test_finished)
+        # 显示测试结果
+        result_text = "镜像源速度测试结果:\n\n"
+        for name, url, delay in results:
+            if delay == float('inf'):
+                result_text += f"{name}: 连接失败\n"
+            else:
+                result_text += f"{name}: {delay:.2f}ms\n"
+                
+        QMessageBox.information(self, "测速结果", result_text)
+        self.add_notification("镜像源速度测试完成", "info")
+        
+    def on_speed_test_error(self, error_msg: str):
+        """镜像源测速错误处理"""
+        self._speed_test_in_progress = False
+        self.progress_bar.setVisible(False)
+        self.add_notification(error_msg, "error")
+        
+    def on_mirror_error(self, error_msg: str):
+        """镜像源操作错误处理"""
+        self.add_notification(error_msg, "error")
         
     def configure_proxy(self):
         """配置代理"""
         dialog = ProxyDialog(self)
         
         # 加载当前配置
-        proxy_config = self.config_manager.load_config('proxy')
+        proxy_config = self._get_cached_config('proxy')
         dialog.set_proxy_config(proxy_config)
         
         if dialog.exec_() == ProxyDialog.Accepted:
-            # 保存新配置
+            # 立即应用新配置，稍后合并写入磁盘
             new_config = dialog.get_proxy_config()
-            if self.config_manager.save_config('proxy', new_config):
-                self.add_notification("代理设置已保存", "info")
-                self.apply_proxy_settings(new_config)
-            else:
-                self.add_notification("保存代理设置失败", "error")
+            self.apply_proxy_settings(new_config)
+            self._queue_config_save('proxy', new_config)
                 
     def configure_theme(self):
         """配置主题"""
         dialog = ThemeDialog(self)
         
         # 加载当前配置
-        theme_config = self.config_manager.load_config('theme')
+        theme_config = self._get_cached_config('theme')
         dialog.set_theme_config(theme_config)
         
         if dialog.exec_() == ThemeDialog.Accepted:
-            # 保存新配置
+            # 立即应用新配置，稍后合并写入磁盘
             new_config = dialog.get_theme_config()
-            if self.config_manager.save_config('theme', new_config):
-                self.add_notification("主题设置已保存", "info")
-                self.apply_theme(new_config)
+            self.apply_theme(new_config)
+            self._queue_config_save('theme', new_config)
+                
+    def _queue_config_save(self, name: str, config: dict):
+        """将配置加入待保存队列，短时间内的多次修改合并为一次写入
+        Args:
+            name: 配置名称
+            config: 配置数据
+        """
+        self._pending_configs[name] = config
+        self._config_cache[name] = config
+        self._flush_timer.start(500)
+        
+    def _flush_configs(self):
+        """将待保存的配置写入磁盘"""
+        self._flush_timer.stop()
+        pending, self._pending_configs = self._pending_configs, {}
+        labels = {'proxy': "代理", 'theme': "主题"}
+        for name, config in pending.items():
+            label = labels.get(name, name)
+            if self.config_manager.save_config(name, config):
+                self.add_notification(f"{label}设置已保存", "info")
             else:
-                self.add_notification("保存主题设置失败", "error")
+                # 保存失败时丢弃缓存，下次从磁盘重新读取
+                self._config_cache.pop(name, None)
+                self.add_notification(f"保存{label}设置失败", "error")
                 
     def apply_proxy_settings(self, config: dict):
         """应用代理设置"""
         try:
+            # 配置未变化时不重复设置环境变量
+            if config == self._last_proxy:
+                return
+                
+            target = {}
             if config.get('enabled', False):
                 proxy_type = config.get('type', 'HTTP').lower()
                 host = config.get('host', '')
@@ -850,16 +1240,23 @@ class MainWindow(QMainWindow):
                 else:
                     proxy_url = f"{proxy_type}://{host}:{port}"
                     
-                # 设置环境变量
-                os.environ['HTTP_PROXY'] = proxy_url if proxy_type == 'http' else ''
-                os.environ['HTTPS_PROXY'] = proxy_url if proxy_type == 'http' else ''
-                os.environ['SOCKS_PROXY'] = proxy_url if proxy_type == 'socks5' else ''
-                
-            else:
-                # 清除代理设置
-                os.environ.pop('HTTP_PROXY', None)
-                os.environ.pop('HTTPS_PROXY', None)
-                os.environ.pop('SOCKS_PROXY', None)
+                # HTTP代理设置HTTP_PROXY/HTTPS_PROXY，SOCKS5代理设置SOCKS_PROXY
+                if proxy_type == 'http':
+                    target['HTTP_PROXY'] = target['HTTPS_PROXY'] = proxy_url
+                elif proxy_type == 'socks5':
+                    target['SOCKS_PROXY'] = proxy_url
+                    
+            # 只删除本程序设置且未被其他地方修改过的变量，不影响用户自己设置的代理
+            for key, value in self._proxy_env.items():
+                if key not in target and os.environ.get(key) == value:
+                    del os.environ[key]
+                    
+            # 只修改有变化的环境变量
+            for key, value in target.items():
+                if os.environ.get(key) != value:
+                    os.environ[key] = value
+            self._proxy_env = target
+            self._last_proxy = dict(config)
                 
         except Exception as e:
             logging.error(f"应用代理设置时出错: {str(e)}")
@@ -870,122 +1267,28 @@ class MainWindow(QMainWindow):
             if not config:
                 return
                 
-            # 构建样式表
-            style = f"""
-            QMainWindow, QDialog {{
-                background-color: {config.get('background', '#FFFFFF')};
-                color: {config.get('text', '#000000')};
-            }}
-            
-            QPushButton {{
-                background-color: {config.get('primary', '#1976D2')};
-                color: white;
-                border: none;
-                padding: 5px 10px;
-                border-radius: 3px;
-            }}
-            
-            QPushButton:hover {{
-                background-color: {config.get('secondary', '#424242')};
-            }}
-            
-            QPushButton:disabled {{
-                background-color: #CCCCCC;
-                color: #666666;
-            }}
-            
-            QTableWidget {{
-                background-color: {config.get('background', '#FFFFFF')};
-                color: {config.get('text', '#000000')};
-                gridline-color: {config.get('secondary', '#424242')};
-                border: 1px solid {config.get('secondary', '#424242')};
-            }}
-            
-            QTableWidget::item:selected {{
-                background-color: {config.get('primary', '#1976D2')};
-                color: white;
-            }}
-            
-            QHeaderView::section {{
-                background-color: {config.get('secondary', '#424242')};
-                color: white;
-                padding: 5px;
-                border: none;
-            }}
-            
-            QLineEdit, QComboBox, QSpinBox {{
-                background-color: {config.get('background', '#FFFFFF')};
-                color: {config.get('text', '#000000')};
-                border: 1px solid {config.get('secondary', '#424242')};
-                padding: 5px;
-                border-radius: 3px;
-            }}
-            
-            QComboBox::drop-down {{
-                border: none;
-                background-color: {config.get('primary', '#1976D2')};
-                width: 20px;
-            }}
-            
-            QComboBox::down-arrow {{
-                width: 12px;
-                height: 12px;
-                background: white;
-            }}
-            
-            QCheckBox {{
-                color: {config.get('text', '#000000')};
-            }}
-            
-            QCheckBox::indicator {{
-                width: 15px;
-                height: 15px;
-            }}
-            
-            QCheckBox::indicator:checked {{
-                background-color: {config.get('primary', '#1976D2')};
-                border: 2px solid {config.get('primary', '#1976D2')};
-            }}
-            
-            QCheckBox::indicator:unchecked {{
-                background-color: white;
-                border: 2px solid {config.get('secondary', '#424242')};
-            }}
-            
-            QMenu {{
-                background-color: {config.get('background', '#FFFFFF')};
-                color: {config.get('text', '#000000')};
-                border: 1px solid {config.get('secondary', '#424242')};
-            }}
-            
-            QMenu::item:selected {{
-                background-color: {config.get('primary', '#1976D2')};
-                color: white;
-            }}
-            
-            QScrollBar:vertical {{
-                background-color: {config.get('background', '#FFFFFF')};
-                width: 12px;
-                margin: 0px;
-            }}
-            
-            QScrollBar::handle:vertical {{
-                background-color: {config.get('secondary', '#424242')};
-                min-height: 20px;
-                border-radius: 6px;
-            }}
-            
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0px;
-            }}
-            """
-            
-            # 应用样式表
+            # 按主题颜色缓存生成的样式表，相同颜色不再重复校验和构建
+            key = tuple(config.get(name, default) for name, default in _THEME_DEFAULTS)
+            style = self._theme_cache.get(key)
+            if style is None:
+                style = _render_theme(_theme_colors(config))
+                
+                self._theme_cache[key] = style
+                if len(self._theme_cache) > 8:
+                    self._theme_cache.popitem(last=False)
+            else:
+                self._theme_cache.move_to_end(key)
+                
+            # 样式表未变化时不重新设置，避免所有控件重新polish
+            if style == self._last_style:
+                return
+            self._last_style = style
             self.setStyleSheet(style)
             
         except Exception as e:
             logging.error(f"应用主题设置时出错: {str(e)}")
             # 出错时使用基本样式
+            self._last_style = ""
             self.setStyleSheet("")
         
     def show_advanced_search(self):
@@ -994,20 +1297,20 @@ class MainWindow(QMainWindow):
         
     def show_package_info(self):
         """显示包信息"""
-        current_row = self.package_table.currentRow()
-        if current_row < 0:
+        # 直接从加载时保存的包信息中读取，不经过表格模型
+        name = self._current_package_name()
+        package = self._last_packages.get(name) if name else None
+        if package is None:
             return
             
-        name = self.package_table.item(current_row, 0).text()
-        version = self.package_table.item(current_row, 1).text()
-        location = self.package_table.item(current_row, 2).text()
-        install_time = self.package_table.item(current_row, 3).text()
-        requires = self.package_table.item(current_row, 4).text()
+        requires = package.get('requires') or []
+        if not isinstance(requires, str):
+            requires = ", ".join(requires)
         
         info = f"""包名: {name}
-版本: {version}
-位置: {location}
-安装时间: {install_time}
+版本: {package.get('version', '')}
+位置: {package.get('location', '')}
+安装时间: {package.get('install_time') or ''}
 依赖: {requires}"""
         
         QMessageBox.information(self, "包信息", info)
@@ -1018,21 +1321,58 @@ class MainWindow(QMainWindow):
             message: 通知消息
             level: 通知级别 (info/warning/error)
         """
-        notification = QLabel(message)
+        # 与最新一条通知相同时只更新时间戳，不再新建控件
+        if self._last_notification and self._last_notification[:2] == (message, level):
+            self._last_notification[2].setText(self._notification_time())
+            return
+            
+        # 优先复用已清除的控件，达到上限时复用最早的通知
+        if self._notif_free:
+            slot = self._notif_free.pop()
+        elif len(self._notif_ring) == self._notif_ring.maxlen:
+            slot = self._notif_ring.popleft()
+            self.notification_layout.removeWidget(slot[0])
+        else:
+            slot = self._create_notification_slot()
+        notification_item, notification, timestamp, slot_level = slot
+        
+        notification.setText(message)
+        # 级别不变时沿用控件已有的样式，避免重新解析样式表
+        if level != slot_level:
+            notification.setStyleSheet(_NOTIF_STYLES.get(level, _NOTIF_DEFAULT))
+            slot[3] = level
+        timestamp.setText(self._notification_time())
+        
+        self.notification_layout.insertWidget(0, notification_item)
+        notification_item.show()
+        self._notif_ring.append(slot)
+        self._last_notification = (message, level, timestamp)
+        
+    def _notification_time(self) -> str:
+        """获取通知时间戳文本，同一秒内复用已格式化的结果"""
+        sec = int(time.time())
+        if sec != self._last_ts[0]:
+            self._last_ts = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+        return self._last_ts[1]
+        
+    def _create_notification_slot(self) -> list:
+        """创建一个通知控件
+        Returns:
+            list: [容器, 消息标签, 时间戳标签, 级别]，级别为空表示尚未设置样式
+        """
+        notification = QLabel()
         notification.setWordWrap(True)
-        notification.setStyleSheet(self.get_notification_style(level))
         
         # 添加时间戳
-        timestamp = QLabel(datetime.now().strftime("%H:%M:%S"))
-        timestamp.setStyleSheet("color: gray; font-size: 10px;")
+        timestamp = QLabel()
+        timestamp.setStyleSheet(_TS_STYLE)
         
         # 创建通知项容器
         notification_item = QWidget()
         item_layout = QVBoxLayout(notification_item)
         item_layout.addWidget(notification)
         item_layout.addWidget(timestamp)
-        
-        self.notification_layout.insertWidget(0, notification_item)
+        return [notification_item, notification, timestamp, None]
         
     def get_notification_style(self, level: str) -> str:
         """获取通知样式
@@ -1041,19 +1381,17 @@ class MainWindow(QMainWindow):
         Returns:
             str: CSS样式
         """
-        styles = {
-            "info": "background-color: #e3f2fd; color: #0d47a1; padding: 5px; border-radius: 3px;",
-            "warning": "background-color: #fff3e0; color: #e65100; padding: 5px; border-radius: 3px;",
-            "error": "background-color: #ffebee; color: #c62828; padding: 5px; border-radius: 3px;"
-        }
-        return styles.get(level, styles["info"])
+        return _NOTIF_STYLES.get(level, _NOTIF_DEFAULT)
         
     def clear_notifications(self):
         """清除所有通知"""
-        while self.notification_layout.count():
-            item = self.notification_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        # 控件只隐藏并放回空闲列表，下次添加通知时复用
+        for slot in self._notif_ring:
+            self.notification_layout.removeWidget(slot[0])
+            slot[0].hide()
+        self._notif_free.extend(self._notif_ring)
+        self._notif_ring.clear()
+        self._last_notification = None
         
     def check_updates(self):
         """检查包更新"""
@@ -1061,6 +1399,8 @@ class MainWindow(QMainWindow):
             self.add_notification("请先选择环境", "warning")
             return
             
+        if not self.package_manager.check_updates_async():
+            self.add_notification("正在加载包列表，请稍后再试", "warning")
+            return
         self.progress_bar.setVisible(True)
-        self.progress_bar.setValue(0)
-        self.package_manager.check_updates() 
\ No newline at end of file
+        self.progress_bar.setValue(0) 
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import Dict, List
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+class PackageModel(QAbstractTableModel):
+    """包列表数据模型，按列保存包信息，不为每个单元格创建对象"""
+    
+    # 列标题
+    HEADERS = ["包名", "当前版本", "最新版本", "位置", "安装时间"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cols = [[] for _ in self.HEADERS]
+        
+    def reset_with(self, package_info: Dict[str, dict]):
+        """使用新的包信息替换全部数据
+        Args:
+            package_info: 包信息字典，包名 -> 包信息
+        """
+        self.beginResetModel()
+        self._cols = self._build_columns(package_info)
+        self.endResetModel()
+        
+    def update_with(self, package_info: Dict[str, dict]):
+        """使用新的包信息更新数据，包列表不变时只刷新内容变化的行
+        Args:
+            package_info: 包信息字典，包名 -> 包信息
+        """
+        if list(package_info) != self._cols[0]:
+            self.reset_with(package_info)
+            return
+            
+        old_cols = self._cols
+        self._cols = self._build_columns(package_info)
+        last_column = len(self.HEADERS) - 1
+        for row in range(len(self._cols[0])):
+            if any(old[row] != new[row] for old, new in zip(old_cols, self._cols)):
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+                
+    def upsert_packages(self, package_info: Dict[str, dict]):
+        """更新已有包所在的行，新的包追加到末尾
+        Args:
+            package_info: 包信息字典，包名 -> 包信息
+        """
+        rows = {name: row for row, name in enumerate(self._cols[0])}
+        new_cols = self._build_columns({name: info for name, info in package_info.items() if name not in rows})
+        last_column = len(self.HEADERS) - 1
+        for name, info in package_info.items():
+            row = rows.get(name)
+            if row is None:
+                continue
+            for col, value in zip(self._cols, self._build_columns({name: info})):
+                col[row] = value[0]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+            
+        if new_cols[0]:
+            first = len(self._cols[0])
+            self.beginInsertRows(QModelIndex(), first, first + len(new_cols[0]) - 1)
+            for col, values in zip(self._cols, new_cols):
+                col.extend(values)
+            self.endInsertRows()
+            
+    def remove_package(self, name: str) -> bool:
+        """删除指定包所在的行
+        Args:
+            name: 包名
+        Returns:
+            bool: 是否找到并删除
+        """
+        try:
+            row = self._cols[0].index(name)
+        except ValueError:
+            return False
+            
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for col in self._cols:
+            del col[row]
+        self.endRemoveRows()
+        return True
+        
+    @staticmethod
+    def _build_columns(package_info: Dict[str, dict]) -> List[list]:
+        """将包信息字典转换为按列保存的列表"""
+        infos = package_info.values()
+        return [
+            list(package_info),
+            [info['version'] for info in infos],
+            [info.get('latest_version', '') for info in infos],
+            [info['location'] for info in infos],
+            [info['install_time'] or '' for info in infos]
+        ]
+        
+    def value(self, row: int, column: int) -> str:
+        """获取指定单元格的文本
+        Args:
+            row: 行号
+            column: 列号
+        Returns:
+            str: 单元格文本
+        """
+        return self._cols[column][row]
+        
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """行数"""
+        return 0 if parent.isValid() else len(self._cols[0])
+        
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """列数"""
+        return 0 if parent.isValid() else len(self.HEADERS)
+        
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """单元格数据，提供显示文本，Qt.UserRole为所在行的包名"""
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._cols[index.column()][index.row()]
+        if role == Qt.UserRole:
+            return self._cols[0][index.row()]
+        return None
+        
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        """表头数据"""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
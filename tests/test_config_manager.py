@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core import config_manager
+from src.core.config_manager import ConfigManager
+
+
+class ConfigManagerTest(unittest.TestCase):
+    """配置的缓存与保存"""
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.manager = ConfigManager(self.tmp)
+        self.manager.save_config('app', {'a': 1})
+    
+    def test_load_returns_copy(self):
+        config = self.manager.load_config('app')
+        config['a'] = 100
+        self.assertEqual(self.manager.load_config('app'), {'a': 1})
+    
+    def test_load_sees_external_change(self):
+        self.manager.load_config('app')
+        other = ConfigManager(self.tmp)
+        other.save_config('app', {'a': 2, 'padding': 'x' * 64})
+        self.assertEqual(self.manager.load_config('app')['a'], 2)
+    
+    def test_load_missing_file(self):
+        self.manager.load_config('app')
+        os.remove(self.manager.get_config_path('app'))
+        self.assertIsNone(self.manager.load_config('app'))
+    
+    def test_set_value_without_autosave_waits_for_flush(self):
+        self.assertTrue(self.manager.set_config_value('app', 'b', 2, autosave=False))
+        self.assertEqual(self.manager.load_config('app'), {'a': 1, 'b': 2})
+        self.assertEqual(ConfigManager(self.tmp).load_config('app'), {'a': 1})
+        
+        self.assertTrue(self.manager.flush())
+        self.assertEqual(ConfigManager(self.tmp).load_config('app'), {'a': 1, 'b': 2})
+    
+    def test_dirty_config_survives_missing_file(self):
+        self.manager.set_config_value('app', 'b', 2, autosave=False)
+        os.remove(self.manager.get_config_path('app'))
+        
+        self.assertEqual(self.manager.load_config('app'), {'a': 1, 'b': 2})
+        self.assertTrue(self.manager.flush())
+        self.assertEqual(ConfigManager(self.tmp).load_config('app'), {'a': 1, 'b': 2})
+    
+    def test_list_configs(self):
+        self.manager.save_config('other', {})
+        os.makedirs(os.path.join(self.tmp, 'dir.json'))
+        self.assertEqual(sorted(self.manager.list_configs()), ['app', 'other'])
+    
+    @unittest.skipIf(config_manager.orjson is None, "需要orjson")
+    def test_dumps_format_does_not_depend_on_orjson(self):
+        data = {'a': 1, 'b': {'c': [1, '中文'], 'd': None}, 'e': True}
+        with_orjson = config_manager._dumps(data)
+        with mock.patch.object(config_manager, 'orjson', None):
+            self.assertEqual(config_manager._dumps(data), with_orjson)
+
+
+if __name__ == '__main__':
+    unittest.main()
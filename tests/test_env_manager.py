@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core import env_manager
+
+
+class CopyFileTest(unittest.TestCase):
+    """导入环境时使用的_copy_file"""
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        env_manager._REFLINK_UNSUPPORTED.clear()
+        self.addCleanup(env_manager._REFLINK_UNSUPPORTED.clear)
+        
+        self.src = os.path.join(self.tmp, 'src.bin')
+        with open(self.src, 'wb') as f:
+            f.write(os.urandom(256 * 1024))
+        os.chmod(self.src, 0o750)
+        os.utime(self.src, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+    
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    def assertCopied(self, dst):
+        self.assertEqual(self._read(dst), self._read(self.src))
+        self.assertEqual(os.stat(dst).st_mtime_ns, os.stat(self.src).st_mtime_ns)
+        self.assertEqual(os.stat(dst).st_mode, os.stat(self.src).st_mode)
+    
+    def test_copy_preserves_content_and_metadata(self):
+        dst = os.path.join(self.tmp, 'dst.bin')
+        self.assertEqual(env_manager._copy_file(self.src, dst), dst)
+        self.assertCopied(dst)
+    
+    @unittest.skipIf(env_manager.fcntl is None, "需要fcntl")
+    def test_reflink_failure_falls_back_to_copy2(self):
+        dst = os.path.join(self.tmp, 'dst.bin')
+        with mock.patch.object(env_manager.fcntl, 'ioctl', side_effect=OSError) as ioctl, \
+             mock.patch.object(env_manager.shutil, 'copy2', wraps=shutil.copy2) as copy2:
+            env_manager._copy_file(self.src, dst)
+            env_manager._copy_file(self.src, dst)
+        
+        # 不支持reflink的设备只尝试一次
+        self.assertLessEqual(ioctl.call_count, 1)
+        self.assertEqual(copy2.call_count, 2)
+        self.assertCopied(dst)
+    
+    def test_copytree_with_copy_file(self):
+        tree = os.path.join(self.tmp, 'tree')
+        os.makedirs(os.path.join(tree, 'sub'))
+        shutil.copy2(self.src, os.path.join(tree, 'sub', 'a.bin'))
+        os.symlink('sub/a.bin', os.path.join(tree, 'link'))
+        
+        dst = os.path.join(self.tmp, 'copy')
+        shutil.copytree(tree, dst, symlinks=True, copy_function=env_manager._copy_file)
+        self.assertEqual(self._read(os.path.join(dst, 'sub', 'a.bin')), self._read(self.src))
+        self.assertEqual(os.readlink(os.path.join(dst, 'link')), 'sub/a.bin')
+
+
+
+class FastRmtreeTest(unittest.TestCase):
+    """删除环境目录"""
+    
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, True)
+    
+    def test_removes_env_dir_with_shell_characters(self):
+        path = os.path.join(self.root, 'x&y|z%PATH%')
+        os.makedirs(os.path.join(path, 'lib'))
+        with open(os.path.join(path, 'lib', 'f'), 'w') as f:
+            f.write('x')
+        os.chmod(os.path.join(path, 'lib', 'f'), 0o444)
+        
+        env_manager._fast_rmtree(path, self.root)
+        self.assertFalse(os.path.lexists(path))
+        self.assertTrue(os.path.isdir(self.root))
+    
+    def test_refuses_paths_outside_root(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside, True)
+        for path in (self.root, outside, os.path.join(self.root, '..', os.path.basename(outside))):
+            with self.subTest(path=path), self.assertRaises(ValueError):
+                env_manager._fast_rmtree(path, self.root)
+        self.assertTrue(os.path.isdir(outside))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from PyQt5.QtCore import QCoreApplication
+
+from src.core import package_manager
+from src.core.package_manager import PackageManager, PYPI_JSON_URL
+
+
+class RunJsonTest(unittest.TestCase):
+    """_run_json的输出读取"""
+    
+    def test_large_stderr_does_not_block(self):
+        code = "import sys, json; sys.stderr.write('x' * (1 << 20)); print(json.dumps({'ok': 1}))"
+        returncode, data, stderr = package_manager._run_json([sys.executable, '-c', code])
+        self.assertEqual((returncode, data), (0, {'ok': 1}))
+        self.assertEqual(len(stderr), 1 << 20)
+    
+    def test_failure_returns_none(self):
+        code = "import sys; sys.stderr.write('boom'); sys.exit(3)"
+        self.assertEqual(package_manager._run_json([sys.executable, '-c', code]), (3, None, 'boom'))
+
+
+class DistributionsScriptTest(unittest.TestCase):
+    """在目标解释器中读取包元数据的脚本"""
+    
+    def setUp(self):
+        self.site = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.site)
+        dist_info = os.path.join(self.site, 'Demo_Pkg-1.0.dist-info')
+        os.makedirs(dist_info)
+        with open(os.path.join(dist_info, 'METADATA'), 'w') as f:
+            f.write(
+                "Metadata-Version: 2.1\n"
+                "Name: Demo.Pkg\n"
+                "Version: 1.0\n"
+                "Requires-Dist: alpha\n"
+                "Requires-Dist: beta; extra==\"x\"\n"
+                "Requires-Dist: gamma ; extra== 'y'\n"
+                "Requires-Dist: delta; (python_version >= \"3\" and extra == \"z\")\n"
+                "Requires-Dist: epsilon>=1; python_version >= \"3\"\n"
+            )
+    
+    def test_reads_requires_and_install_time(self):
+        env = dict(os.environ, PYTHONPATH=self.site)
+        returncode, packages, stderr = package_manager._run_json(
+            [sys.executable, '-c', package_manager._DISTRIBUTIONS_SCRIPT], env)
+        self.assertEqual(returncode, 0, stderr)
+        
+        demo = next(pkg for pkg in packages if pkg['name'] == 'Demo.Pkg')
+        self.assertEqual(demo['version'], '1.0')
+        self.assertEqual(os.path.realpath(demo['location']), os.path.realpath(self.site))
+        # 只属于extras的依赖不计入
+        self.assertEqual(demo['requires'], ['alpha', 'epsilon'])
+        self.assertIsNotNone(demo['ctime'])
+
+
+class PackageManagerTest(unittest.TestCase):
+    """包管理器的缓存指纹、索引地址、检查更新与增量刷新"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+    
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.manager = PackageManager(sys.executable, 'test', self.tmp)
+    
+    def test_site_fingerprint_changes_on_install(self):
+        site_dir = os.path.join(self.tmp, 'site')
+        os.makedirs(site_dir)
+        missing = os.path.join(self.tmp, 'missing')
+        before = PackageManager._site_fingerprint([site_dir, missing])
+        self.assertIsNone(before[missing])
+        
+        os.makedirs(os.path.join(site_dir, 'pkg'))
+        os.utime(site_dir, ns=(before[site_dir] + 1_000_000, before[site_dir] + 1_000_000))
+        self.assertNotEqual(PackageManager._site_fingerprint([site_dir, missing]), before)
+    
+    def test_json_url_follows_index(self):
+        cases = [
+            ((None, None), PYPI_JSON_URL),
+            (('https://mirror.example/simple/', None), 'https://mirror.example/pypi/{name}/json'),
+            (('https://mirror.example/repo', None), None),
+            ((None, 'https://extra.example/simple'), None),
+        ]
+        for urls, expected in cases:
+            with self.subTest(urls=urls), mock.patch.object(self.manager, '_get_index_urls', return_value=urls):
+                self.assertEqual(self.manager._get_json_url(), expected)
+    
+    def test_index_urls_read_once(self):
+        with mock.patch.object(self.manager, '_read_index_urls', return_value=(None, None)) as read:
+            self.manager._get_index_urls()
+            self.manager._get_index_urls()
+        self.assertEqual(read.call_count, 1)
+    
+    def test_json_api_checked_once(self):
+        with mock.patch.object(self.manager, '_get_session') as get_session:
+            get_session.return_value.get.return_value = mock.Mock(ok=False, status_code=404)
+            self.assertFalse(self.manager._has_json_api('https://mirror.example/pypi/{name}/json'))
+            self.assertFalse(self.manager._has_json_api('https://mirror.example/pypi/{name}/json'))
+        self.assertEqual(get_session.return_value.get.call_count, 1)
+    
+    def test_check_updates_without_json_api(self):
+        run_json = package_manager._run_json
+        calls = []
+        
+        def fake_run_json(cmd, env=None):
+            if '--outdated' in cmd:
+                calls.append(cmd)
+                return 0, [{'name': 'PIP', 'version': '0', 'latest_version': '999.0'}], ''
+            return run_json(cmd, env)
+            
+        results = []
+        self.manager.package_loaded.connect(results.append)
+        with mock.patch.object(self.manager, '_get_index_urls', return_value=('https://mirror.example/repo', None)), \
+             mock.patch.object(package_manager, '_run_json', fake_run_json):
+            self.manager.check_updates()
+            
+        self.assertEqual(len(calls), 1)
+        package_info = results[0]
+        self.assertEqual(package_info['pip']['latest_version'], '999.0')
+        for name, info in package_info.items():
+            # 与加载包列表的记录结构相同
+            self.assertLessEqual(set(self.manager.package_info[name]), set(info))
+            if name != 'pip':
+                self.assertEqual(info['latest_version'], info['version'])
+    
+    def test_incremental_emit_only_changes(self):
+        info = {'version': '1.0', 'location': '/site', 'install_time': None, 'requires': []}
+        old = {'a': dict(info), 'b': dict(info), 'gone': dict(info)}
+        self.manager.package_info = {'a': dict(info), 'b': dict(info, version='2.0'), 'new': dict(info)}
+        self.manager._latest_versions = {'b': '2.0'}
+        
+        results = []
+        self.manager.packages_changed.connect(lambda changed, removed: results.append((changed, removed)))
+        self.manager._emit_packages(old, incremental=True)
+        
+        changed, removed = results[0]
+        self.assertEqual(sorted(changed), ['b', 'new'])
+        self.assertEqual(changed['b']['latest_version'], '2.0')
+        self.assertEqual(changed['new']['latest_version'], '')
+        self.assertEqual(removed, ['gone'])
+
+
+if __name__ == '__main__':
+    unittest.main()
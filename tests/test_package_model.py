@@ -0,0 +1,73 @@
+import unittest
+
+from PyQt5.QtCore import QCoreApplication, Qt
+
+from src.ui.package_model import PackageModel
+
+
+def _info(version, latest=''):
+    return {'version': version, 'latest_version': latest, 'location': '/site', 'install_time': None}
+
+
+class PackageModelTest(unittest.TestCase):
+    """包列表模型与增量更新"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+    
+    def setUp(self):
+        self.model = PackageModel()
+        self.model.reset_with({'a': _info('1.0'), 'b': _info('2.0'), 'c': _info('3.0')})
+        self.events = []
+        self.model.dataChanged.connect(lambda top, bottom: self.events.append(('changed', top.row(), bottom.row())))
+        self.model.modelReset.connect(lambda: self.events.append(('reset',)))
+        self.model.rowsInserted.connect(lambda parent, first, last: self.events.append(('inserted', first, last)))
+        self.model.rowsRemoved.connect(lambda parent, first, last: self.events.append(('removed', first, last)))
+    
+    def names(self):
+        return [self.model.value(row, 0) for row in range(self.model.rowCount())]
+    
+    def test_reset_with(self):
+        self.model.reset_with({'x': dict(_info('1.0', '1.1'), install_time='2024-01-01 00:00:00')})
+        self.assertEqual(self.names(), ['x'])
+        self.assertEqual([self.model.value(0, column) for column in range(self.model.columnCount())],
+                         ['x', '1.0', '1.1', '/site', '2024-01-01 00:00:00'])
+        self.assertEqual(self.model.data(self.model.index(0, 1)), '1.0')
+    
+    def test_user_role_is_package_name(self):
+        for column in range(self.model.columnCount()):
+            self.assertEqual(self.model.data(self.model.index(1, column), Qt.UserRole), 'b')
+    
+    def test_header_data(self):
+        self.assertEqual([self.model.headerData(column, Qt.Horizontal) for column in range(self.model.columnCount())],
+                         PackageModel.HEADERS)
+        self.assertIsNone(self.model.headerData(0, Qt.Vertical))
+    
+    def test_update_with_only_changed_rows(self):
+        self.model.update_with({'a': _info('1.0'), 'b': _info('2.1'), 'c': _info('3.0')})
+        self.assertEqual(self.events, [('changed', 1, 1)])
+        self.assertEqual(self.model.value(1, 1), '2.1')
+    
+    def test_update_with_different_packages_resets(self):
+        self.model.update_with({'a': _info('1.0'), 'd': _info('4.0')})
+        self.assertEqual(self.events, [('reset',)])
+        self.assertEqual(self.names(), ['a', 'd'])
+        self.assertEqual(self.model.value(1, 4), '')
+    
+    def test_remove_package(self):
+        self.assertTrue(self.model.remove_package('b'))
+        self.assertFalse(self.model.remove_package('missing'))
+        self.assertEqual(self.events, [('removed', 1, 1)])
+        self.assertEqual(self.names(), ['a', 'c'])
+        self.assertEqual(self.model.value(1, 1), '3.0')
+    
+    def test_upsert_packages(self):
+        self.model.upsert_packages({'c': _info('3.1', '3.1'), 'd': _info('4.0'), 'e': _info('5.0')})
+        self.assertEqual(self.events, [('changed', 2, 2), ('inserted', 3, 4)])
+        self.assertEqual(self.names(), ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual([self.model.value(2, column) for column in (1, 2)], ['3.1', '3.1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
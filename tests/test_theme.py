@@ -0,0 +1,31 @@
+import unittest
+
+from src.ui.dialogs.theme_dialog import ThemeDialog
+from src.ui.main_window import _render_theme, _theme_colors, _THEME_DEFAULTS
+
+
+class ThemeTest(unittest.TestCase):
+    """主题颜色校验与样式表生成"""
+    
+    def test_invalid_colors_use_defaults(self):
+        with self.assertLogs(level='WARNING'):
+            colors = _theme_colors({'background': 'nope', 'text': '#123456', 'primary': 5})
+        defaults = dict(_THEME_DEFAULTS)
+        self.assertEqual(colors, (defaults['background'], '#123456', defaults['primary'], defaults['secondary']))
+    
+    def test_render_uses_every_color(self):
+        colors = ('#000001', '#000002', '#000003', '#000004')
+        style = _render_theme(colors)
+        for color in colors:
+            self.assertIn(color, style)
+        self.assertNotIn('$', style)
+    
+    def test_predefined_themes_render(self):
+        for name, config in ThemeDialog.PREDEFINED_THEMES.items():
+            with self.subTest(theme=name):
+                style = _render_theme(_theme_colors(config))
+                self.assertIn(config['background'], style)
+
+
+if __name__ == '__main__':
+    unittest.main()